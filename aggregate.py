@@ -0,0 +1,215 @@
+import math
+from collections import Counter
+
+
+# ---------------------------
+# Streaming audit aggregates
+# ---------------------------
+#
+# Fold evaluate_password results into a fixed-size summary instead of
+# keeping them: memory depends on the value ranges, never on how many
+# passwords were seen. Every aggregate has merge(), so worker processes can
+# summarise their own chunks and the parent just adds the partial summaries.
+#
+#   IntHistogram    exact counts for small non-negative integers (score, length)
+#   QuantileSketch  log-bucketed sketch (as in DDSketch): any quantile within
+#                   a fixed relative error, e.g. entropy bits, guesses
+#   AuditSummary    the lot for one audit, plus label and suggestion counts
+
+REPORT_QUANTILES = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+DEFAULT_RELATIVE_ACCURACY = 0.01
+MAX_LENGTH_BIN = 128
+SCORE_BUCKET = 10
+
+
+def _quantile_name(q: float) -> str:
+    return f"p{q * 100:g}"
+
+
+class IntHistogram:
+    # One bin per value in [0, size); larger values land in the last bin
+
+    __slots__ = ("counts",)
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+
+    def add(self, value: int, count: int = 1) -> None:
+        counts = self.counts
+        counts[min(max(0, int(value)), len(counts) - 1)] += count
+
+    def merge(self, other: "IntHistogram") -> None:
+        if len(other.counts) != len(self.counts):
+            raise ValueError("cannot merge histograms of different sizes")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def mean(self) -> float:
+        n = self.count
+        return sum(v * c for v, c in enumerate(self.counts)) / n if n else 0.0
+
+    def quantile(self, q: float) -> int:
+        # Exact (nearest-rank) for values below the overflow bin
+        n = self.count
+        if not n:
+            return 0
+        rank = max(1, math.ceil(q * n))
+        seen = 0
+        for value, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return value
+        return len(self.counts) - 1
+
+    def buckets(self, width: int) -> dict:
+        # {"lo-hi": count} over `width`-wide ranges, empty ranges left out
+        out = {}
+        for lo in range(0, len(self.counts), width):
+            hi = min(lo + width, len(self.counts)) - 1
+            c = sum(self.counts[lo:hi + 1])
+            if c:
+                out[f"{lo}-{hi}" if lo != hi else str(lo)] = c
+        return out
+
+
+class QuantileSketch:
+    # Non-negative values. Bucket i holds (gamma^(i-1), gamma^i]; reporting
+    # the bucket's midpoint keeps every quantile within `relative_accuracy`.
+
+    __slots__ = ("relative_accuracy", "_gamma_log", "bins", "zeros", "count", "total", "min", "max")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._gamma_log = math.log(gamma)
+        self.bins = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        if value < 0 or value != value:
+            raise ValueError("QuantileSketch only takes non-negative numbers")
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value == 0:
+            self.zeros += 1
+            return
+        i = math.ceil(math.log(value) / self._gamma_log)
+        bins = self.bins
+        bins[i] = bins.get(i, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different accuracy")
+        bins = self.bins
+        for i, c in other.bins.items():
+            bins[i] = bins.get(i, 0) + c
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        if rank <= self.zeros:
+            return 0.0
+        seen = self.zeros
+        gamma = math.exp(self._gamma_log)
+        for i in sorted(self.bins):
+            seen += self.bins[i]
+            if seen >= rank:
+                estimate = 2 * gamma ** i / (gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def summary(self, quantiles=REPORT_QUANTILES, digits: int = 2) -> dict:
+        if not self.count:
+            return {"count": 0}
+        out = {"count": self.count, "min": round(self.min, digits), "mean": round(self.mean(), digits)}
+        for q in quantiles:
+            out[_quantile_name(q)] = round(self.quantile(q), digits)
+        out["max"] = round(self.max, digits)
+        return out
+
+
+class AuditSummary:
+    __slots__ = ("count", "labels", "suggestions", "scores", "lengths", "entropy", "guesses")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        self.count = 0
+        self.labels = Counter()
+        self.suggestions = Counter()
+        self.scores = IntHistogram(101)
+        self.lengths = IntHistogram(MAX_LENGTH_BIN + 1)
+        self.entropy = QuantileSketch(relative_accuracy)
+        self.guesses = QuantileSketch(relative_accuracy)
+
+    def add(self, result: dict, password: str = None) -> None:
+        self.count += 1
+        self.labels[result["label"]] += 1
+        self.suggestions.update(result["suggestions"])
+        self.scores.add(result["score"])
+        self.entropy.add(result["entropy_bits"])
+        self.guesses.add(result["guesses_log10"])
+        if password is not None:
+            self.lengths.add(len(password))
+
+    def add_many(self, results, passwords=None) -> None:
+        if passwords is None:
+            for result in results:
+                self.add(result)
+        else:
+            for result, password in zip(results, passwords):
+                self.add(result, password)
+
+    def merge(self, other: "AuditSummary") -> "AuditSummary":
+        self.count += other.count
+        self.labels.update(other.labels)
+        self.suggestions.update(other.suggestions)
+        self.scores.merge(other.scores)
+        self.lengths.merge(other.lengths)
+        self.entropy.merge(other.entropy)
+        self.guesses.merge(other.guesses)
+        return self
+
+    def report(self) -> dict:
+        # Compact, JSON-ready; sketch quantiles are approximate (relative_accuracy)
+        scores = self.scores
+        out = {
+            "count": self.count,
+            "labels": dict(self.labels.most_common()),
+            "score": {
+                "mean": round(scores.mean(), 2),
+                **{_quantile_name(q): scores.quantile(q) for q in REPORT_QUANTILES},
+                "histogram": scores.buckets(SCORE_BUCKET),
+            },
+            "entropy_bits": self.entropy.summary(),
+            "guesses_log10": self.guesses.summary(),
+            "suggestions": dict(self.suggestions.most_common()),
+        }
+        if self.lengths.count:
+            lengths = self.lengths
+            out["length"] = {
+                "mean": round(lengths.mean(), 2),
+                **{_quantile_name(q): lengths.quantile(q) for q in REPORT_QUANTILES},
+                f"{MAX_LENGTH_BIN}+": lengths.counts[-1],
+            }
+        return out
@@ -1,10 +1,10 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, colorchooser
-import ctypes
 import math
-import re
-import secrets
+import os
 import string
+import sys
+
+from keyboard import ADJACENT
+from matching import LEET_MAP, MIN_DICT_WORD_LEN, AhoCorasick, PrefixTrie
 
 
 # ---------------------------
@@ -13,39 +13,6 @@ import string
 
 SAFE_SYMBOLS = "!@#$%^&*()-_=+[]{};:,.?/"
 
-def _hex_to_rgb(hex_color: str) -> tuple:
-    h = hex_color.lstrip('#')
-    return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
-
-def _rgb_to_hex(rgb: tuple) -> str:
-    r, g, b = rgb
-    return f"#{r:02x}{g:02x}{b:02x}"
-
-def _brightness(rgb: tuple) -> float:
-    r, g, b = rgb
-    return (r * 299 + g * 587 + b * 114) / 1000.0
-
-def _best_text_color(bg_hex: str) -> str:
-    br = _brightness(_hex_to_rgb(bg_hex))
-    return "#000000" if br >= 128 else "#ffffff"
-
-def _shade(hex_color: str, amount: float) -> str:
-    # amount: -1.0..1.0 negative=darken, positive=lighten
-    r, g, b = _hex_to_rgb(hex_color)
-    if amount >= 0:
-        r = int(r + (255 - r) * amount)
-        g = int(g + (255 - g) * amount)
-        b = int(b + (255 - b) * amount)
-    else:
-        amt = 1 + amount
-        r = int(r * amt)
-        g = int(g * amt)
-        b = int(b * amt)
-    r = max(0, min(255, r))
-    g = max(0, min(255, g))
-    b = max(0, min(255, b))
-    return _rgb_to_hex((r, g, b))
-
 COMMON_PASSWORDS = {
     "123456","password","123456789","12345","12345678","qwerty","1234567","111111","123123",
     "abc123","password1","1234","iloveyou","000000","qwerty123","1q2w3e4r","admin","letmein",
@@ -64,6 +31,105 @@ COMMON_WORDS = {
     "welcome1","admin1","hello","freedom","trust","whatever","qazwsx","asdf","zxcv","zaq","iloveu"
 }
 
+# Optional local breach corpus (see breach.py); opened lazily via mmap
+BREACH_INDEX_ENV = "LASAGNA_BREACH_INDEX"
+_BREACH_INDEX = None
+
+
+def load_breach_index(path: str):
+    global _BREACH_INDEX
+    from breach import BreachIndex
+
+    index = BreachIndex(path)
+    if _BREACH_INDEX is not None:
+        _BREACH_INDEX.close()
+    _BREACH_INDEX = index
+    return index
+
+
+def _load_env_breach_index() -> None:
+    if _BREACH_INDEX is None and os.environ.get(BREACH_INDEX_ENV):
+        try:
+            load_breach_index(os.environ[BREACH_INDEX_ENV])
+        except (OSError, ValueError):
+            pass
+
+
+# Optional per-stage timing (see profiling.py); None keeps scoring uninstrumented
+PROFILE_ENV = "LASAGNA_PROFILE"
+_PROFILER = None
+
+
+def set_profiler(profiler):
+    # Installs a profiling.StageProfiler (or None); returns the previous one
+    global _PROFILER
+    previous, _PROFILER = _PROFILER, profiler
+    return previous
+
+
+if os.environ.get(PROFILE_ENV):
+    from profiling import StageProfiler
+
+    set_profiler(StageProfiler())
+
+
+def _build_word_matcher(words) -> AhoCorasick:
+    return AhoCorasick(sorted(w for w in words if len(w) >= MIN_DICT_WORD_LEN))
+
+
+# Matchers, the guess estimator and the LASAGNA_BREACH_INDEX index are
+# built on first use (load_data), so startup and commands that never score
+# a password don't pay for them.
+_DATA_LOADED = False
+_WORD_MATCHER = None
+# Exact-match trie over COMMON_PASSWORDS for the incremental evaluator
+_COMMON_TRIE = None
+# Bumped whenever the dictionaries above change; modules that derive their
+# own tables from them (vectorized) rebuild when it moves
+DICT_GENERATION = 0
+
+
+def load_data() -> None:
+    global _DATA_LOADED, _WORD_MATCHER, _COMMON_TRIE, DICT_GENERATION
+    if _DATA_LOADED:
+        return
+    DICT_GENERATION += 1
+    _WORD_MATCHER = _build_word_matcher(COMMON_WORDS)
+    _COMMON_TRIE = PrefixTrie(COMMON_PASSWORDS)
+    _rebuild_guess_estimator()
+    _load_env_breach_index()
+    _DATA_LOADED = True
+
+
+def install_dictionaries(common_passwords, common_words, word_matcher, guess_estimator) -> None:
+    # Swaps in prebuilt structures, e.g. flat views over shared memory from
+    # shareddict.attach(); they must offer the same lookups as the originals
+    global _DATA_LOADED, COMMON_PASSWORDS, COMMON_WORDS, _WORD_MATCHER, _COMMON_TRIE, _GUESS_ESTIMATOR
+    global DICT_GENERATION
+    DICT_GENERATION += 1
+    COMMON_PASSWORDS = common_passwords
+    COMMON_WORDS = common_words
+    _WORD_MATCHER = word_matcher
+    _COMMON_TRIE = PrefixTrie(common_passwords)
+    _GUESS_ESTIMATOR = guess_estimator
+    _load_env_breach_index()
+    _DATA_LOADED = True
+
+
+def load_common_words(path: str, encoding: str = "utf-8") -> int:
+    # Extend the dictionary check with an external wordlist (one word per line)
+    global COMMON_WORDS, _WORD_MATCHER, DICT_GENERATION
+    load_data()
+    with open(path, "r", encoding=encoding, errors="ignore") as fh:
+        words = {line.strip().lower() for line in fh}
+    words.discard("")
+    DICT_GENERATION += 1
+    COMMON_WORDS = COMMON_WORDS | words
+    _WORD_MATCHER = _build_word_matcher(COMMON_WORDS)
+    _rebuild_guess_estimator()
+    return len(words)
+
+
 PASSPHRASE_WORDS = [
     "able","acid","aged","also","area","army","away","baby","back","ball","band","bank","base",
     "bath","bear","beat","been","beer","bell","belt","best","bill","bird","blow","blue","boat",
@@ -103,36 +169,233 @@ PASSPHRASE_WORDS = [
     "wood","wool","word","wore","work","yard","yeah","year","your"
 ]
 
+# Optional external passphrase wordlist (see wordlist.py); opened lazily via mmap
+WORDLIST_ENV = "LASAGNA_WORDLIST"
+_PASSPHRASE_LIST = None
+
+
+def load_passphrase_words(path: str):
+    global _PASSPHRASE_LIST
+    from wordlist import Wordlist
+
+    words = Wordlist(path)
+    if _PASSPHRASE_LIST is not None:
+        _PASSPHRASE_LIST.close()
+    _PASSPHRASE_LIST = words
+    return words
+
+
+def passphrase_words():
+    # The loaded (or LASAGNA_WORDLIST) wordlist, else the built-in words
+    if _PASSPHRASE_LIST is None and os.environ.get(WORDLIST_ENV):
+        try:
+            load_passphrase_words(os.environ[WORDLIST_ENV])
+        except (OSError, ValueError):
+            pass
+    return _PASSPHRASE_LIST if _PASSPHRASE_LIST is not None else PASSPHRASE_WORDS
+
+
+def passphrase_entropy(num_words: int, list_size: int = None, add_number: bool = True) -> float:
+    # Exact bits of a generated passphrase: every word is a uniform pick from
+    # `list_size` distinct words, plus two uniform digits. (With a strength
+    # target, rejected draws lower this by log2 of the acceptance rate.)
+    num_words = max(3, min(10, int(num_words)))
+    list_size = len(passphrase_words()) if list_size is None else list_size
+    return num_words * math.log2(list_size) + (math.log2(100) if add_number else 0.0)
+
+_GUESS_ESTIMATOR = None
+
+
+def _rebuild_guess_estimator() -> None:
+    global _GUESS_ESTIMATOR
+    from guesses import GuessEstimator
+
+    _GUESS_ESTIMATOR = GuessEstimator([COMMON_PASSWORDS, COMMON_WORDS, PASSPHRASE_WORDS])
+
+
+def estimate_guesses(password: str) -> tuple:
+    # (log10 guesses, [(start, end, pattern, token)]) for the cheapest way a
+    # pattern-aware attacker could guess the password
+    if not _DATA_LOADED:
+        load_data()
+    return _GUESS_ESTIMATOR.estimate(password)
+
 
 def _deleet(text: str) -> str:
-    mapping = str.maketrans({
-        '0': 'o', '1': 'l', '3': 'e', '4': 'a', '5': 's', '7': 't', '@': 'a', '$': 's', '!': 'i'
-    })
-    return text.translate(mapping)
+    return text.translate(LEET_MAP)
+
+
+def dictionary_matches(password: str) -> list:
+    # [(start, end, word)] for dictionary words found in the password, either
+    # as typed (case-insensitive) or after undoing common leetspeak swaps.
+    if not _DATA_LOADED:
+        load_data()
+    lower_p = password.lower()
+    found = set(_WORD_MATCHER.find_all(lower_p))
+    found.update(_WORD_MATCHER.find_all(_deleet(lower_p)))
+    return sorted(found)
+
+
+# Character class bits
+_LOWER = 1
+_UPPER = 2
+_DIGIT = 4
+_SYMBOL = 8
+_ALPHA = 16
+# Sequences run within letters or within digits
+_SEQ_CLASSES = _ALPHA | _DIGIT
+
+
+def _char_class(ch: str) -> int:
+    bits = 0
+    if ch.islower():
+        bits |= _LOWER
+    if ch.isupper():
+        bits |= _UPPER
+    if ch.isdigit():
+        bits |= _DIGIT
+    if ch in SAFE_SYMBOLS:
+        bits |= _SYMBOL
+    if ch.isalpha():
+        bits |= _ALPHA
+    return bits
+
+
+# Class bits per character: ASCII up front, anything else cached on first sight
+_CHAR_CLASSES = {chr(i): _char_class(chr(i)) for i in range(128)}
+
+
+def _class_of(ch: str) -> int:
+    bits = _CHAR_CLASSES.get(ch)
+    if bits is None:
+        bits = _CHAR_CLASSES[ch] = _char_class(ch)
+    return bits
+
+
+class _Features:
+    # Everything scoring and entropy need from one password, gathered in a
+    # single pass by _extract_features (or maintained by IncrementalEvaluator)
+    __slots__ = ("length", "lowers", "uppers", "digits", "symbols", "alphas",
+                 "distinct", "seqs", "walks", "repeats", "lower", "deleeted")
+
+    def __init__(self, length: int, lowers: int, uppers: int, digits: int, symbols: int,
+                 alphas: int, distinct: int, seqs: int, walks: int, repeats: int,
+                 lower: str = None, deleeted: str = None) -> None:
+        self.length = length
+        self.lowers = lowers
+        self.uppers = uppers
+        self.digits = digits
+        self.symbols = symbols
+        self.alphas = alphas
+        self.distinct = distinct
+        self.seqs = seqs
+        self.walks = walks
+        self.repeats = repeats
+        self.lower = lower
+        self.deleeted = deleeted
+
+
+# Run patterns, each counted once per window it fills (so a longer run
+# counts more), all from the same pass as the character classes:
+#   seqs     3 letters or 3 digits stepping by +1 or -1   abc, 987, ZYX
+#   walks    4 keys, each next to the one before on one   qwer, zaq1, 2wsx
+#            layout (keyboard.ADJACENT); pure +1/-1 runs
+#            such as 1234 count as sequences instead
+#   repeats  3 of the same character                      aaa, 111
+
+
+def _extract_features(password: str) -> _Features:
+    classes = _CHAR_CLASSES
+    adjacent = ADJACENT
+    by_class = {}
+    seqs = walks = repeats = 0
+    # Previous ordinal, the last two ordinal steps, class bits of the two
+    # previous characters, keyboard index of the previous one (its ordinal
+    # if ASCII, else 0) and layout bits shared by the last two key pairs
+    o2 = -2
+    d0 = d1 = 0
+    b1 = b2 = 0
+    k2 = j1 = j2 = 0
+    for ch in password:
+        bits = classes.get(ch)
+        if bits is None:
+            bits = classes[ch] = _char_class(ch)
+        by_class[bits] = by_class.get(bits, 0) + 1
+        o = ord(ch)
+        d = o - o2
+        if d == d1:
+            if d == 1 or d == -1:
+                if bits & b1 & b2 & _SEQ_CLASSES:
+                    seqs += 1
+            elif not d:
+                repeats += 1
+        if o < 128:
+            j = adjacent[k2 << 7 | o]
+            k2 = o
+        else:
+            j = k2 = 0
+        if j & j1 & j2 and not (d == d1 == d0 and (d == 1 or d == -1)):
+            walks += 1
+        o2, d0, d1 = o, d1, d
+        b1, b2 = b2, bits
+        j1, j2 = j2, j
+
+    lowers = uppers = digits = symbols = alphas = 0
+    for bits, n in by_class.items():
+        if bits & _LOWER:
+            lowers += n
+        if bits & _UPPER:
+            uppers += n
+        if bits & _DIGIT:
+            digits += n
+        if bits & _SYMBOL:
+            symbols += n
+        if bits & _ALPHA:
+            alphas += n
+    lower = password.lower()
+    return _Features(len(password), lowers, uppers, digits, symbols, alphas,
+                     len(set(password)), seqs, walks, repeats, lower, lower.translate(LEET_MAP))
+
+
+def _is_sequence(a: str, b: str, c: str) -> bool:
+    # Ascending or descending letter or digit triple
+    d = ord(b) - ord(a)
+    return ((d == 1 or d == -1) and ord(c) - ord(b) == d
+            and bool(_class_of(a) & _class_of(b) & _class_of(c) & _SEQ_CLASSES))
+
+
+def _is_repeat(a: str, b: str, c: str) -> bool:
+    return a == b == c
+
+
+def _key(ch: str) -> int:
+    o = ord(ch)
+    return o if o < 128 else 0
+
+
+def _is_walk(a: str, b: str, c: str, d: str) -> bool:
+    # Four keys in a row on one keyboard layout, not a plain +1/-1 run
+    ka, kb, kc, kd = _key(a), _key(b), _key(c), _key(d)
+    if not ADJACENT[ka << 7 | kb] & ADJACENT[kb << 7 | kc] & ADJACENT[kc << 7 | kd]:
+        return False
+    step = ord(b) - ord(a)
+    return not ((step == 1 or step == -1) and ord(c) - ord(b) == step and ord(d) - ord(c) == step)
 
 
 def _sequences_count(password: str) -> int:
-    if len(password) < 3:
-        return 0
-    sequences = 0
-    # Check ascending sequences in letters and digits
-    for i in range(len(password) - 2):
-        a, b, c = password[i], password[i + 1], password[i + 2]
-        if a.isalpha() and b.isalpha() and c.isalpha():
-            if ord(b) == ord(a) + 1 and ord(c) == ord(b) + 1:
-                sequences += 1
-        if a.isdigit() and b.isdigit() and c.isdigit():
-            if int(b) == int(a) + 1 and int(c) == int(b) + 1:
-                sequences += 1
-    return sequences
+    return _extract_features(password).seqs
 
 
 def _charset_size(password: str) -> int:
+    return _feature_charset_size(_extract_features(password))
+
+
+def _feature_charset_size(f: _Features) -> int:
+    return _charset_size_from(f.lowers > 0, f.uppers > 0, f.digits > 0, f.symbols > 0)
+
+
+def _charset_size_from(lowers: bool, uppers: bool, digits: bool, symbols: bool) -> int:
     size = 0
-    lowers = any(c.islower() for c in password)
-    uppers = any(c.isupper() for c in password)
-    digits = any(c.isdigit() for c in password)
-    symbols = any(c in SAFE_SYMBOLS for c in password)
     size += 26 if lowers else 0
     size += 26 if uppers else 0
     size += 10 if digits else 0
@@ -141,8 +404,11 @@ def _charset_size(password: str) -> int:
 
 
 def _entropy_bits(password: str) -> float:
-    size = _charset_size(password)
-    return len(password) * math.log2(size)
+    return _feature_entropy(_extract_features(password))
+
+
+def _feature_entropy(f: _Features) -> float:
+    return f.length * math.log2(_feature_charset_size(f))
 
 
 def _human_time(seconds: float) -> str:
@@ -168,23 +434,28 @@ def _human_time(seconds: float) -> str:
     return f"{amount:.1f} {unit}"
 
 
-def evaluate_password(password: str) -> dict:
-    if not password:
-        return {
-            "score": 0,
-            "label": "",
-            "color": "#666666",
-            "entropy_bits": 0.0,
-            "crack_time": "",
-            "suggestions": ["Type a password to evaluate it."],
-        }
+EMPTY_RESULT = {
+    "score": 0,
+    "label": "",
+    "color": "#666666",
+    "entropy_bits": 0.0,
+    "guesses_log10": 0.0,
+    "crack_time": "",
+    "suggestions": ["Type a password to evaluate it."],
+}
+
 
+def _build_result(f: _Features, common: bool, dictionary: bool, breached: bool,
+                  ent: float, guesses_log10: float) -> dict:
+    # Shared by the full and incremental evaluators: turns the per-password
+    # features into score, label, suggestions and crack-time estimate.
     suggestions = []
-    length = len(password)
-    lowers = any(c.islower() for c in password)
-    uppers = any(c.isupper() for c in password)
-    digits = any(c.isdigit() for c in password)
-    symbols = any(c in SAFE_SYMBOLS for c in password)
+    length = f.length
+    lowers = f.lowers > 0
+    uppers = f.uppers > 0
+    digits = f.digits > 0
+    symbols = f.symbols > 0
+    seqs = f.seqs
 
     # Base score from length (up to 40)
     score = min(length, 20) * 2
@@ -202,14 +473,14 @@ def evaluate_password(password: str) -> dict:
         score += 5
 
     # Penalties
-    if password.isalpha():
+    if f.alphas == length:
         score -= 15
         suggestions.append("Avoid only letters; add digits and symbols.")
-    if password.isdigit():
+    if f.digits == length:
         score -= 20
         suggestions.append("Avoid only numbers; add letters and symbols.")
 
-    unique_ratio = len(set(password)) / max(1, len(password))
+    unique_ratio = f.distinct / max(1, length)
     repeated_ratio = 1 - unique_ratio
     if repeated_ratio > 0.40:
         score -= 15
@@ -217,23 +488,28 @@ def evaluate_password(password: str) -> dict:
     elif repeated_ratio > 0.25:
         score -= 10
 
-    seqs = _sequences_count(password)
     if seqs:
         score -= min(20, 10 * seqs)
-        suggestions.append("Avoid sequences like 'abc' or '123'.")
+        suggestions.append("Avoid sequences like 'abc', '123' or '987'.")
 
-    lower_p = password.lower()
-    deleeted = _deleet(lower_p)
-    if lower_p in COMMON_PASSWORDS or deleeted in COMMON_PASSWORDS:
+    if f.walks:
+        score -= min(20, 10 * f.walks)
+        suggestions.append("Avoid keyboard patterns like 'qwerty' or 'zaq12wsx'.")
+
+    if f.repeats:
+        score -= min(15, 5 * f.repeats)
+        suggestions.append("Avoid runs of the same character like 'aaa'.")
+
+    if common:
         score -= 40
         suggestions.append("This password is commonly used. Pick something more unique.")
+    elif breached:
+        score -= 40
+        suggestions.append("This password appears in known data breaches. Never use it.")
 
-    # Dictionary substrings
-    for word in COMMON_WORDS:
-        if len(word) >= 4 and (word in lower_p or word in deleeted):
-            score -= 15
-            suggestions.append("Avoid dictionary words or obvious phrases.")
-            break
+    if dictionary:
+        score -= 15
+        suggestions.append("Avoid dictionary words or obvious phrases.")
 
     # Positive guidance
     if length < 12:
@@ -246,7 +522,8 @@ def evaluate_password(password: str) -> dict:
         suggestions.append("Add digits.")
     if not symbols:
         suggestions.append("Add special characters (e.g., !@#...).")
-    if categories >= 3 and length >= 12 and not seqs and repeated_ratio <= 0.25:
+    if (categories >= 3 and length >= 12 and not seqs and not f.walks and not f.repeats
+            and repeated_ratio <= 0.25):
         # Already quite good; add optional advice
         suggestions.append("Consider a 4–5 word passphrase for memorability.")
 
@@ -268,21 +545,240 @@ def evaluate_password(password: str) -> dict:
         label = "Very Strong"
         color = "#27ae60"
 
-    ent = _entropy_bits(password)
-    # Assume 1e9 guesses/second (powerful rig), average-case half the keyspace
-    seconds = (2 ** ent) / (1e9 * 2)
-    return {
+    # Crack time follows the pattern-aware guess estimate rather than the
+    # charset keyspace. Assume 1e9 guesses/second (powerful rig); the exponent
+    # is capped to stay within float range for very long inputs.
+    # Without an estimate (guesses_log10=None) the result has no
+    # guesses_log10 / crack_time keys.
+    result = {
         "score": score,
         "label": label,
         "color": color,
         "entropy_bits": ent,
-        "crack_time": _human_time(seconds),
-        "suggestions": suggestions[:6] if suggestions else ["Looks good. Keep it unique for each site."]
     }
+    if guesses_log10 is not None:
+        seconds = (10 ** min(guesses_log10, 300.0)) / 1e9
+        result["guesses_log10"] = guesses_log10
+        result["crack_time"] = _human_time(seconds)
+    result["suggestions"] = suggestions[:6] if suggestions else ["Looks good. Keep it unique for each site."]
+    return result
 
 
-def generate_password(length: int = 16) -> str:
-    length = max(8, min(64, int(length)))
+def evaluate_password(password: str, guesses: bool = True) -> dict:
+    # guesses=False leaves out "guesses_log10" and "crack_time" (see _score_features)
+    if not password:
+        return dict(EMPTY_RESULT, suggestions=list(EMPTY_RESULT["suggestions"]))
+    if not _DATA_LOADED:
+        load_data()
+
+    prof = _PROFILER
+    if prof is not None:
+        return _evaluate_profiled(password, prof, guesses)
+    f = _extract_features(password)
+    return _score_features(
+        password,
+        f,
+        common=f.lower in COMMON_PASSWORDS or f.deleeted in COMMON_PASSWORDS,
+        # Dictionary substrings (one automaton pass per view of the password)
+        dictionary=_WORD_MATCHER.search(f.lower) or _WORD_MATCHER.search(f.deleeted),
+        guesses=guesses,
+    )
+
+
+def _score_features(password: str, f: _Features, common: bool, dictionary: bool,
+                    guesses: bool = True) -> dict:
+    # Lookups that need the password itself, then the score. The guess
+    # estimate (crack time) is the costly part; guesses=False skips it.
+    prof = _PROFILER
+    if prof is not None:
+        return _score_profiled(password, f, common, dictionary, prof, guesses)
+    return _build_result(
+        f,
+        common,
+        dictionary,
+        breached=not common and _BREACH_INDEX is not None and password in _BREACH_INDEX,
+        ent=_feature_entropy(f),
+        guesses_log10=_GUESS_ESTIMATOR.estimate(password)[0] if guesses else None,
+    )
+
+
+# Same steps as above, timed per stage (only while a profiler is installed)
+
+def _evaluate_profiled(password: str, prof, guesses: bool = True) -> dict:
+    begin = t = prof.start()
+    f = _extract_features(password)
+    t = prof.lap("features", t)
+    common = f.lower in COMMON_PASSWORDS or f.deleeted in COMMON_PASSWORDS
+    t = prof.lap("common", t)
+    dictionary = _WORD_MATCHER.search(f.lower) or _WORD_MATCHER.search(f.deleeted)
+    prof.lap("dictionary", t)
+    result = _score_profiled(password, f, common, dictionary, prof, guesses)
+    prof.lap("total", begin)
+    return result
+
+
+def _score_profiled(password: str, f: _Features, common: bool, dictionary: bool, prof,
+                    guesses: bool = True) -> dict:
+    t = prof.start()
+    breached = not common and _BREACH_INDEX is not None and password in _BREACH_INDEX
+    t = prof.lap("breach", t)
+    ent = _feature_entropy(f)
+    t = prof.lap("entropy", t)
+    guesses_log10 = None
+    if guesses:
+        guesses_log10 = _GUESS_ESTIMATOR.estimate(password)[0]
+        t = prof.lap("guesses", t)
+    result = _build_result(f, common, dictionary, breached, ent, guesses_log10)
+    prof.lap("score", t)
+    return result
+
+
+class IncrementalEvaluator:
+    # Keeps running per-position state for the text typed so far, so the live
+    # meter can re-score in O(1) when characters are appended or removed at
+    # the end. Pastes and mid-string edits fall back to a full rescan.
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        load_data()
+        self.text = ""
+        self._matcher = _WORD_MATCHER
+        self._trie = _COMMON_TRIE
+        self._counts = {}
+        self._lowers = self._uppers = self._digits = self._symbols = self._alphas = 0
+        # Per position: (lower automaton state, deleet automaton state,
+        # lower trie node, deleet trie node, cumulative sequences, keyboard
+        # walks and repeats, cumulative dictionary hits)
+        root = self._trie.root
+        self._stack = [(0, 0, root, root, 0, 0, 0, 0)]
+
+    def _push(self, ch: str) -> None:
+        text = self.text
+        self._counts[ch] = self._counts.get(ch, 0) + 1
+        bits = _class_of(ch)
+        self._lowers += bits & _LOWER and 1
+        self._uppers += bits & _UPPER and 1
+        self._digits += bits & _DIGIT and 1
+        self._symbols += bits & _SYMBOL and 1
+        self._alphas += bits & _ALPHA and 1
+
+        matcher, trie = self._matcher, self._trie
+        m_low, m_leet, t_low, t_leet, seqs, walks, repeats, hits = self._stack[-1]
+        if len(text) >= 2:
+            seqs += _is_sequence(text[-2], text[-1], ch)
+            repeats += _is_repeat(text[-2], text[-1], ch)
+        if len(text) >= 3:
+            walks += _is_walk(text[-3], text[-2], text[-1], ch)
+        # A few characters lowercase to more than one (e.g. 'İ')
+        for low in ch.lower():
+            leet = _deleet(low)
+            m_low = matcher.step(m_low, low)
+            m_leet = matcher.step(m_leet, leet)
+            if matcher.matches_at(m_low) or matcher.matches_at(m_leet):
+                hits += 1
+            t_low = trie.walk(t_low, low)
+            t_leet = trie.walk(t_leet, leet)
+        self._stack.append((m_low, m_leet, t_low, t_leet, seqs, walks, repeats, hits))
+        self.text = text + ch
+
+    def _pop(self) -> None:
+        ch = self.text[-1]
+        n = self._counts[ch] - 1
+        if n:
+            self._counts[ch] = n
+        else:
+            del self._counts[ch]
+        bits = _class_of(ch)
+        self._lowers -= bits & _LOWER and 1
+        self._uppers -= bits & _UPPER and 1
+        self._digits -= bits & _DIGIT and 1
+        self._symbols -= bits & _SYMBOL and 1
+        self._alphas -= bits & _ALPHA and 1
+        self._stack.pop()
+        self.text = self.text[:-1]
+
+    def update(self, password: str, guesses: bool = True) -> dict:
+        # guesses=False leaves out the guess estimate (guesses_log10 and
+        # crack_time), which costs time proportional to the whole password;
+        # fetch it afterwards with result() once input has settled
+        old = self.text
+        if self._matcher is not _WORD_MATCHER or self._trie is not _COMMON_TRIE:
+            # Dictionaries were swapped out underneath us
+            self.reset()
+            old = ""
+        prof = _PROFILER
+        begin = prof.start() if prof is not None else 0
+        if len(password) == len(old) + 1 and password.startswith(old):
+            self._push(password[-1])
+        elif len(password) == len(old) - 1 and old.startswith(password):
+            self._pop()
+        elif password != old:
+            self.reset()
+            for ch in password:
+                self._push(ch)
+        if prof is None:
+            return self.result(guesses)
+        prof.lap("incremental", begin)
+        result = self.result(guesses)
+        prof.lap("total", begin)
+        return result
+
+    def result(self, guesses: bool = True) -> dict:
+        password = self.text
+        if not password:
+            return evaluate_password(password)
+        _, _, t_low, t_leet, seqs, walks, repeats, hits = self._stack[-1]
+        f = _Features(len(password), self._lowers, self._uppers, self._digits, self._symbols,
+                      self._alphas, len(self._counts), seqs, walks, repeats)
+        return _score_features(
+            password,
+            f,
+            common=self._trie.is_word(t_low) or self._trie.is_word(t_leet),
+            dictionary=hits > 0,
+            guesses=guesses,
+        )
+
+
+# ---------------------------
+# Generation
+# ---------------------------
+
+# Candidates drawn per generate_* call before an unreachable target is reported
+MAX_GENERATE_ATTEMPTS = 1000
+
+
+def meets_target(password: str, min_score: int = None, min_guesses_log10: float = None) -> bool:
+    # Cheapest check first: the score needs no guess estimate, so most
+    # rejected candidates never reach the (much slower) estimator.
+    if not _DATA_LOADED:
+        load_data()
+    if min_score is not None:
+        f = _extract_features(password)
+        common = f.lower in COMMON_PASSWORDS or f.deleeted in COMMON_PASSWORDS
+        dictionary = _WORD_MATCHER.search(f.lower) or _WORD_MATCHER.search(f.deleeted)
+        breached = not common and _BREACH_INDEX is not None and password in _BREACH_INDEX
+        if _build_result(f, common, dictionary, breached, 0.0, None)["score"] < min_score:
+            return False
+    if min_guesses_log10 is not None:
+        return _GUESS_ESTIMATOR.estimate(password)[0] >= min_guesses_log10
+    return True
+
+
+def _generate_until(draw, min_score: int = None, min_guesses_log10: float = None) -> str:
+    if min_score is None and min_guesses_log10 is None:
+        return draw()
+    for _ in range(MAX_GENERATE_ATTEMPTS):
+        candidate = draw()
+        if meets_target(candidate, min_score, min_guesses_log10):
+            return candidate
+    raise ValueError("No candidate reached the requested strength; use longer output or a lower target.")
+
+
+def _draw_password(length: int) -> str:
+    import secrets  # pulls in hashlib/random; only needed when generating
+
     alphabet_letters = string.ascii_letters
     alphabet_digits = string.digits
     alphabet_symbols = SAFE_SYMBOLS
@@ -301,9 +797,10 @@ def generate_password(length: int = 16) -> str:
     return ''.join(pwd_list)
 
 
-def generate_passphrase(num_words: int = 4, separator: str = '-', capitalize: bool = False, add_number: bool = True) -> str:
-    num_words = max(3, min(10, int(num_words)))
-    words = [secrets.choice(PASSPHRASE_WORDS) for _ in range(num_words)]
+def _draw_passphrase(num_words: int, separator: str, capitalize: bool, add_number: bool, wordlist) -> str:
+    import secrets
+
+    words = [secrets.choice(wordlist) for _ in range(num_words)]
     if capitalize:
         words = [w.capitalize() for w in words]
     phrase = separator.join(words)
@@ -312,235 +809,37 @@ def generate_passphrase(num_words: int = 4, separator: str = '-', capitalize: bo
     return phrase
 
 
-# ---------------------------
-# Tkinter Desktop Application
-# ---------------------------
-
-class PasswordCheckerApp(tk.Tk):
-    def __init__(self) -> None:
-        super().__init__()
-        # Set Windows AppUserModelID for taskbar grouping and identity
-        try:
-            ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID("lasanga")
-        except Exception:
-            pass
-        self.title("lasanga – Password Strength Checker")
-        self.geometry("720x520")
-        self.minsize(640, 480)
-
-        self.style = ttk.Style()
-        try:
-            self.style.theme_use('clam')
-        except Exception:
-            pass
-
-        # Determine default background and set current
-        default_bg = self.style.lookup('TFrame', 'background') or self.cget('background') or '#f0f0f0'
-        if default_bg in ("SystemButtonFace", "systemWindowBody"):
-            default_bg = '#f0f0f0'
-        self.default_bg = default_bg
-        self.current_bg = default_bg
-
-        self._build_ui()
-        self._apply_bg_color(self.current_bg)
-
-    def _build_ui(self) -> None:
-        root = ttk.Frame(self, padding=16)
-        root.pack(fill=tk.BOTH, expand=True)
-
-        # Password input row
-        row1 = ttk.Frame(root)
-        row1.pack(fill=tk.X, pady=(0, 8))
-        ttk.Label(row1, text="Password:").pack(side=tk.LEFT)
-
-        self.password_var = tk.StringVar()
-        self.entry = ttk.Entry(row1, textvariable=self.password_var, show='•', width=50, style='App.TEntry')
-        self.entry.pack(side=tk.LEFT, padx=(8, 8), fill=tk.X, expand=True)
-        self.entry.bind('<KeyRelease>', self._on_password_change)
-
-        self.show_var = tk.BooleanVar(value=False)
-        show_cb = ttk.Checkbutton(row1, text="Show", variable=self.show_var, command=self._toggle_show)
-        show_cb.pack(side=tk.LEFT, padx=(0, 8))
-
-        copy_btn = ttk.Button(row1, text="Copy", command=self._copy_password)
-        copy_btn.pack(side=tk.LEFT)
-        clear_btn = ttk.Button(row1, text="Clear", command=self._clear_password)
-        clear_btn.pack(side=tk.LEFT, padx=(8, 0))
-
-        # Generator row
-        row2 = ttk.Frame(root)
-        row2.pack(fill=tk.X, pady=(0, 12))
-        ttk.Label(row2, text="Generator:").pack(side=tk.LEFT)
-
-        self.gen_len_var = tk.IntVar(value=16)
-        ttk.Label(row2, text="Length").pack(side=tk.LEFT, padx=(8, 4))
-        gen_len = ttk.Spinbox(row2, from_=8, to=64, textvariable=self.gen_len_var, width=5, style='App.TSpinbox')
-        gen_len.pack(side=tk.LEFT)
-
-        ttk.Button(row2, text="Generate Strong", command=self._gen_password).pack(side=tk.LEFT, padx=(12, 8))
-        self.pass_words_var = tk.IntVar(value=4)
-        ttk.Label(row2, text="Words").pack(side=tk.LEFT, padx=(8, 4))
-        pass_words = ttk.Spinbox(row2, from_=3, to=10, textvariable=self.pass_words_var, width=4, style='App.TSpinbox')
-        pass_words.pack(side=tk.LEFT)
-        self.pass_caps_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(row2, text="Caps", variable=self.pass_caps_var).pack(side=tk.LEFT, padx=(8, 4))
-        self.pass_nums_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(row2, text="Add Numbers", variable=self.pass_nums_var).pack(side=tk.LEFT)
-        ttk.Button(row2, text="Generate Passphrase", command=self._gen_passphrase).pack(side=tk.LEFT, padx=(12, 0))
-
-        # Background color row
-        row3 = ttk.Frame(root)
-        row3.pack(fill=tk.X, pady=(0, 12))
-        ttk.Label(row3, text="Background:").pack(side=tk.LEFT)
-        ttk.Button(row3, text="Pick...", command=self._pick_bg_color).pack(side=tk.LEFT, padx=(8, 4))
-        ttk.Button(row3, text="Reset", command=self._reset_bg_color).pack(side=tk.LEFT)
-
-        # Meter section
-        meter = ttk.LabelFrame(root, text="Strength")
-        meter.pack(fill=tk.X, pady=(0, 12))
-
-        self.style.configure("meter.Horizontal.TProgressbar", troughcolor="#e6e6e6", background="#27ae60")
-        self.pb = ttk.Progressbar(meter, style="meter.Horizontal.TProgressbar", maximum=100)
-        self.pb.pack(fill=tk.X, padx=12, pady=8)
-
-        stats_row = ttk.Frame(meter)
-        stats_row.pack(fill=tk.X, padx=12, pady=(0, 8))
-        self.strength_label = ttk.Label(stats_row, text="", width=16)
-        self.strength_label.pack(side=tk.LEFT)
-        self.entropy_label = ttk.Label(stats_row, text="")
-        self.entropy_label.pack(side=tk.LEFT, padx=(16, 0))
-        self.time_label = ttk.Label(stats_row, text="")
-        self.time_label.pack(side=tk.RIGHT)
-
-        # Suggestions
-        sug = ttk.LabelFrame(root, text="Suggestions")
-        sug.pack(fill=tk.BOTH, expand=True)
-        self.sug_text = tk.Text(sug, height=10, wrap=tk.WORD)
-        self.sug_text.configure(state=tk.DISABLED)
-        self.sug_text.pack(fill=tk.BOTH, expand=True, padx=12, pady=8)
-
-        # Initial state
-        self._update_ui(evaluate_password(""))
-
-    def _toggle_show(self) -> None:
-        self.entry.configure(show='' if self.show_var.get() else '•')
-
-    def _copy_password(self) -> None:
-        text = self.password_var.get()
-        if not text:
-            messagebox.showinfo("Copy", "Nothing to copy.")
-            return
-        self.clipboard_clear()
-        self.clipboard_append(text)
-        messagebox.showinfo("Copy", "Password copied to clipboard.")
-
-    def _clear_password(self) -> None:
-        self.password_var.set("")
-        self.entry.focus_set()
-
-    def _gen_password(self) -> None:
-        try:
-            n = int(self.gen_len_var.get())
-        except Exception:
-            n = 16
-        pwd = generate_password(n)
-        self.password_var.set(pwd)
-        self._on_password_change()
-
-    def _gen_passphrase(self) -> None:
-        try:
-            n = int(self.pass_words_var.get())
-        except Exception:
-            n = 4
-        pwd = generate_passphrase(
-            num_words=n,
-            separator='-',
-            capitalize=bool(self.pass_caps_var.get()),
-            add_number=bool(self.pass_nums_var.get())
-        )
-        self.password_var.set(pwd)
-        self._on_password_change()
-
-    def _on_password_change(self, _event=None) -> None:
-        result = evaluate_password(self.password_var.get())
-        self._update_ui(result)
-
-    def _update_ui(self, result: dict) -> None:
-        score = result.get("score", 0)
-        label = result.get("label", "")
-        color = result.get("color", "#666666")
-        ent = result.get("entropy_bits", 0.0)
-        crack = result.get("crack_time", "")
-        suggestions = result.get("suggestions", [])
-
-        self.pb['value'] = score
-        self.style.configure("meter.Horizontal.TProgressbar", background=color)
-        if label:
-            self.strength_label.configure(text=f"{label} ({score}/100)")
-        else:
-            self.strength_label.configure(text="")
-        if ent:
-            self.entropy_label.configure(text=f"Entropy: {ent:.1f} bits")
-        else:
-            self.entropy_label.configure(text="")
-        if crack:
-            self.time_label.configure(text=f"Est. crack time: {crack}")
-        else:
-            self.time_label.configure(text="")
-
-        self.sug_text.configure(state=tk.NORMAL)
-        self.sug_text.delete("1.0", tk.END)
-        for s in suggestions:
-            self.sug_text.insert(tk.END, f"• {s}\n")
-        self.sug_text.configure(state=tk.DISABLED)
-
-    def _apply_bg_color(self, bg_hex: str) -> None:
-        try:
-            fg_hex = _best_text_color(bg_hex)
-            bright = _brightness(_hex_to_rgb(bg_hex))
-            field_bg = _shade(bg_hex, 0.09 if bright < 128 else -0.06)
-            trough = _shade(bg_hex, 0.12 if bright < 128 else -0.10)
-
-            # Window background
-            self.configure(background=bg_hex)
-
-            # ttk styles
-            self.style.configure('TFrame', background=bg_hex)
-            self.style.configure('TLabel', background=bg_hex, foreground=fg_hex)
-            self.style.configure('TCheckbutton', background=bg_hex, foreground=fg_hex)
-            self.style.configure('TButton', background=bg_hex, foreground=fg_hex)
-            self.style.configure('TLabelframe', background=bg_hex, foreground=fg_hex)
-            self.style.configure('TLabelframe.Label', background=bg_hex, foreground=fg_hex)
-            self.style.configure('App.TEntry', fieldbackground=field_bg, foreground=fg_hex)
-            self.style.configure('App.TSpinbox', fieldbackground=field_bg, foreground=fg_hex, background=bg_hex)
-            self.style.configure('meter.Horizontal.TProgressbar', troughcolor=trough)
-
-            # Text widget
-            if hasattr(self, 'sug_text'):
-                self.sug_text.configure(bg=bg_hex, fg=fg_hex, insertbackground=fg_hex)
-        except Exception:
-            pass
+def generate_password(length: int = 16, min_score: int = None, min_guesses_log10: float = None) -> str:
+    # With a target, draws until evaluate_password would give at least
+    # min_score / guesses_log10 (ValueError if the target is out of reach)
+    length = max(8, min(64, int(length)))
+    return _generate_until(lambda: _draw_password(length), min_score, min_guesses_log10)
 
-    def _pick_bg_color(self) -> None:
-        try:
-            _, hexcolor = colorchooser.askcolor(title="Choose background color", initialcolor=self.current_bg)
-            if hexcolor:
-                self.current_bg = hexcolor
-                self._apply_bg_color(self.current_bg)
-        except Exception:
-            pass
 
-    def _reset_bg_color(self) -> None:
-        self.current_bg = self.default_bg
-        self._apply_bg_color(self.current_bg)
+def generate_passphrase(num_words: int = 4, separator: str = '-', capitalize: bool = False, add_number: bool = True,
+                        min_score: int = None, min_guesses_log10: float = None, words=None) -> str:
+    # `words`: any sequence of distinct words (default: passphrase_words());
+    # passphrase_entropy() gives the exact strength of the result
+    num_words = max(3, min(10, int(num_words)))
+    wordlist = words if words is not None else passphrase_words()
+    return _generate_until(lambda: _draw_passphrase(num_words, separator, capitalize, add_number, wordlist),
+                           min_score, min_guesses_log10)
 
 
-def main() -> None:
-    app = PasswordCheckerApp()
-    app.mainloop()
+def main(argv: list = None) -> None:
+    # Headless subcommands never import tkinter; the desktop app lives in gui.py
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        # Headless subcommands (e.g. `app.py audit FILE`)
+        from cli import run
+        sys.exit(run(argv))
+    from gui import main as run_gui
+    run_gui()
 
 
 if __name__ == "__main__":
+    # cli/gui import `app`; let them share this module instead of loading it twice
+    sys.modules.setdefault("app", sys.modules[__name__])
     main()
 
 
@@ -0,0 +1,235 @@
+import csv
+import io
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, tee
+
+from app import evaluate_password, load_breach_index, load_common_words
+
+
+# ---------------------------
+# Bulk (headless) evaluation
+# ---------------------------
+
+DEFAULT_CHUNK_SIZE = 2000
+# Chunks in flight per worker; bounds memory while keeping every core busy
+PENDING_PER_WORKER = 2
+
+CSV_FIELDS = ["line", "password", "score", "label", "entropy_bits", "crack_time", "suggestions"]
+
+
+def _evaluate_chunk(passwords: list) -> list:
+    return [evaluate_password(p) for p in passwords]
+
+
+def _summarise_chunk(passwords: list):
+    # Workers fold their own chunk, so only a small summary crosses back
+    from aggregate import AuditSummary
+
+    summary = AuditSummary()
+    for p in passwords:
+        summary.add(evaluate_password(p), p)
+    return summary
+
+
+def _chunks(iterable, size: int):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _map_chunks(chunks, workers: int = None, initializer=None, initargs: tuple = (),
+                func=_evaluate_chunk):
+    # Yields func(chunk) per chunk, in order. Chunks are pulled lazily, at
+    # most PENDING_PER_WORKER per worker ahead of the consumer.
+    # `initializer(*initargs)` runs once per worker (e.g. to load dictionaries).
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for chunk in chunks:
+            yield func(chunk)
+        return
+
+    max_pending = workers * PENDING_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def evaluate_passwords(passwords, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       initializer=None, initargs: tuple = ()):
+    # Yields one result per input password, in input order. Input is consumed
+    # lazily, so memory stays flat no matter how long the iterable is.
+    chunks = _chunks(passwords, max(1, int(chunk_size)))
+    for results in _map_chunks(chunks, workers, initializer, initargs):
+        yield from results
+
+
+def summarise_passwords(passwords, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        initializer=None, initargs: tuple = ()):
+    # One aggregate.AuditSummary for all passwords; memory stays constant
+    from aggregate import AuditSummary
+
+    summary = AuditSummary()
+    chunks = _chunks(passwords, max(1, int(chunk_size)))
+    for part in _map_chunks(chunks, workers, initializer, initargs, func=_summarise_chunk):
+        summary.merge(part)
+    return summary
+
+
+def evaluate_passwords_cached(passwords, cache, workers: int = None,
+                              chunk_size: int = DEFAULT_CHUNK_SIZE, initializer=None,
+                              initargs: tuple = ()):
+    # As evaluate_passwords, but only passwords missing from `cache`
+    # (a resultcache.ResultCache) are scored; new results are stored.
+    plans = deque()
+
+    def misses():
+        # Cache lookups happen as chunks are pulled, so they stay in step
+        # with the worker pool's window
+        for chunk in _chunks(passwords, max(1, int(chunk_size))):
+            keys = cache.keys(chunk)
+            hits = cache.get_many(keys)
+            plans.append((keys, hits))
+            yield [p for p, key in zip(chunk, keys) if key not in hits]
+
+    for scored in _map_chunks(misses(), workers, initializer, initargs):
+        keys, hits = plans.popleft()
+        scored = iter(scored)
+        new = {}
+        results = []
+        for key in keys:
+            result = hits.get(key)
+            if result is None:
+                result = new[key] = next(scored)
+            results.append(result)
+        # Stored before yielding: a consumer that stops pulling (zip, islice)
+        # never resumes the generator past its last result
+        cache.put_many(list(new.items()))
+        yield from results
+
+
+def read_passwords(path: str, encoding: str = "utf-8"):
+    # One password per line; only the line terminator is stripped since
+    # leading/trailing spaces are part of the password.
+    if path == "-":
+        # Same decoding as files: sys.stdin itself decodes strictly
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding=encoding,
+                                  errors="surrogateescape", newline="")
+        try:
+            for line in stream:
+                yield line.rstrip("\r\n")
+        finally:
+            stream.detach()  # leave sys.stdin open
+        return
+    with open(path, "r", encoding=encoding, errors="surrogateescape", newline="") as fh:
+        for line in fh:
+            yield line.rstrip("\r\n")
+
+
+def _row(lineno: int, password: str, result: dict, include_password: bool) -> dict:
+    row = {"line": lineno}
+    if include_password:
+        row["password"] = password
+    row["score"] = result["score"]
+    row["label"] = result["label"]
+    row["entropy_bits"] = round(result["entropy_bits"], 2)
+    row["crack_time"] = result["crack_time"]
+    row["suggestions"] = result["suggestions"]
+    return row
+
+
+def write_results(rows, out, fmt: str = "jsonl", include_password: bool = False) -> int:
+    count = 0
+    if fmt == "csv":
+        fields = [f for f in CSV_FIELDS if include_password or f != "password"]
+        writer = csv.DictWriter(out, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            row["suggestions"] = " | ".join(row["suggestions"])
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False))
+            out.write("\n")
+            count += 1
+    return count
+
+
+def write_summary(summary, out) -> None:
+    json.dump(summary.report(), out, ensure_ascii=False, indent=2)
+    out.write("\n")
+
+
+def _init_worker(words_path: str = None, breach_path: str = None, shared_name: str = None) -> None:
+    # With `shared_name`, dictionaries (words_path included) come from the
+    # parent's shareddict segment instead of being rebuilt in this process
+    if shared_name:
+        from shareddict import attach
+
+        attach(shared_name)
+    elif words_path:
+        load_common_words(words_path)
+    if breach_path:
+        load_breach_index(breach_path)
+
+
+def run_audit(src: str, out, fmt: str = "jsonl", workers: int = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE, include_password: bool = False,
+              words_path: str = None, breach_path: str = None, cache=None) -> int:
+    # fmt "summary" writes one aggregate report (see aggregate.py) instead
+    # of a row per password. `cache`: optional resultcache.ResultCache opened
+    # with the fingerprint for these words_path/breach_path
+    workers = workers or os.cpu_count() or 1
+    shared = None
+    if workers > 1 and words_path:
+        # Build the enlarged dictionaries once here; workers map them
+        # read-only instead of each holding a copy (see shareddict.py)
+        from shareddict import SharedDictionaries
+
+        shared = SharedDictionaries(words_path)
+    try:
+        options = dict(
+            workers=workers,
+            chunk_size=chunk_size,
+            initializer=_init_worker,
+            initargs=(words_path, breach_path, shared.name if shared else None),
+        )
+        if fmt == "summary" and cache is None:
+            summary = summarise_passwords(read_passwords(src), **options)
+            write_summary(summary, out)
+            return summary.count
+        passwords, originals = tee(read_passwords(src))
+        if cache is not None:
+            results = evaluate_passwords_cached(passwords, cache, **options)
+        else:
+            results = evaluate_passwords(passwords, **options)
+        if fmt == "summary":
+            # Cached results come back to this process anyway; fold them here
+            from aggregate import AuditSummary
+
+            summary = AuditSummary()
+            summary.add_many(results, originals)
+            write_summary(summary, out)
+            return summary.count
+        rows = (
+            _row(i, pwd, res, include_password)
+            for i, (pwd, res) in enumerate(zip(originals, results), start=1)
+        )
+        return write_results(rows, out, fmt=fmt, include_password=include_password)
+    finally:
+        if shared is not None:
+            shared.close()
@@ -0,0 +1,606 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import string
+import subprocess
+import sys
+import time
+
+import app
+
+
+# ---------------------------
+# Benchmarks and regression check
+# ---------------------------
+#
+# Usage: python bench.py [case ...] [--save-baseline FILE] [--baseline FILE [--threshold 0.2]]
+#
+# Corpora are seeded, so runs on the same machine are comparable. With
+# --baseline, any metric whose throughput drops by more than the threshold
+# is reported and the exit status is 1.
+
+SEED = 1337
+ALPHABET = string.ascii_letters + string.digits + app.SAFE_SYMBOLS
+ADVERSARIAL_LEN = 10000
+DEFAULT_THRESHOLD = 0.20
+
+# name -> {"ops_per_sec": ..., "p50_us": ..., ...}, filled in by the cases
+RESULTS = {}
+
+
+def _random_corpus(count: int, min_len: int, max_len: int, seed: int = SEED) -> list:
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(ALPHABET) for _ in range(rng.randint(min_len, max_len)))
+        for _ in range(count)
+    ]
+
+
+def _passphrase_corpus(count: int, seed: int = SEED) -> list:
+    rng = random.Random(seed)
+    words = app.PASSPHRASE_WORDS
+    out = []
+    for _ in range(count):
+        picked = [rng.choice(words) for _ in range(rng.randint(3, 6))]
+        if rng.random() < 0.5:
+            picked = [w.capitalize() for w in picked]
+        sep = rng.choice("-_. ")
+        out.append(sep.join(picked) + (f"{sep}{rng.randint(0, 99):02d}" if rng.random() < 0.7 else ""))
+    return out
+
+
+def _adversarial_corpus(length: int = ADVERSARIAL_LEN, seed: int = SEED) -> list:
+    # Inputs that maximise matcher work: long runs, sequences, repeated words,
+    # leet-heavy dictionary text, keyboard walks and non-ASCII
+    rng = random.Random(seed)
+    words = sorted(app.COMMON_WORDS | app.COMMON_PASSWORDS)
+    patterns = [
+        "a",
+        "abcdefghijklmnopqrstuvwxyz",
+        "0123456789",
+        "password",
+        "p@55w0rd!",
+        "qwertyuiop",
+        "1qaz2wsx",
+        "19870412",
+        "".join(rng.choice(words) for _ in range(50)),
+        "".join(rng.choice(ALPHABET) for _ in range(997)),
+        "é€ß漢字²³",
+    ]
+    return [(p * (length // len(p) + 1))[:length] for p in patterns]
+
+
+def _measure(fn, inputs: list, min_seconds: float = 0.5) -> dict:
+    # Per-call latencies over repeated passes until `min_seconds` have been spent
+    timer = time.perf_counter_ns
+    latencies = []
+    spent = 0
+    while spent < min_seconds * 1e9:
+        for item in inputs:
+            start = timer()
+            fn(item)
+            latencies.append(timer() - start)
+        spent = sum(latencies)
+    return _summarise(latencies)
+
+
+def _summarise(latencies_ns: list) -> dict:
+    ordered = sorted(latencies_ns)
+    n = len(ordered)
+
+    def pct(q: float) -> float:
+        return ordered[min(n - 1, int(q / 100.0 * n))] / 1000.0
+
+    return {
+        "ops_per_sec": round(n / (sum(ordered) / 1e9), 1),
+        "p50_us": round(pct(50), 2),
+        "p90_us": round(pct(90), 2),
+        "p99_us": round(pct(99), 2),
+        "max_us": round(ordered[-1] / 1000.0, 2),
+        "calls": n,
+    }
+
+
+def _record(name: str, stats: dict) -> None:
+    RESULTS[name] = stats
+    print(f"{name:32} {stats['ops_per_sec']:12.1f} ops/s   p50 {stats['p50_us']:10.1f} us"
+          f"   p90 {stats['p90_us']:10.1f} us   p99 {stats['p99_us']:10.1f} us")
+
+
+def _time_per_call(fn, inputs: list, min_seconds: float = 0.5) -> float:
+    # Best-of-rounds microseconds per call
+    best = float("inf")
+    spent = 0.0
+    while spent < min_seconds:
+        start = time.perf_counter()
+        for item in inputs:
+            fn(item)
+        elapsed = time.perf_counter() - start
+        spent += elapsed
+        best = min(best, elapsed / len(inputs))
+    return best * 1e6
+
+
+def bench_guesses() -> None:
+    for name, corpus in (
+        ("short", _random_corpus(2000, 8, 16)),
+        ("long", _random_corpus(200, 64, 64)),
+        ("1k", _random_corpus(10, 1000, 1000)),
+    ):
+        _record(f"guesses/{name}", _measure(app.estimate_guesses, corpus))
+
+
+def bench_evaluate() -> None:
+    for name, corpus in (
+        ("short", _random_corpus(2000, 8, 16)),
+        ("long", _random_corpus(200, 64, 64)),
+        ("passphrase", _passphrase_corpus(2000)),
+        ("adversarial", _adversarial_corpus()),
+    ):
+        _record(f"evaluate/{name}", _measure(app.evaluate_password, corpus))
+
+
+def bench_generate() -> None:
+    _record("generate/password", _measure(lambda _: app.generate_password(16), range(1000)))
+    _record("generate/passphrase", _measure(lambda _: app.generate_passphrase(4), range(1000)))
+    # Indexed external wordlist (mmap, O(1) picks) at 200,000 words
+    import tempfile
+    from wordlist import Wordlist, build_wordlist
+
+    rng = random.Random(SEED)
+    with tempfile.TemporaryDirectory() as tmp:
+        src, idx = os.path.join(tmp, "words.txt"), os.path.join(tmp, "words.idx")
+        with open(src, "w", encoding="utf-8") as fh:
+            for _ in range(200000):
+                fh.write("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9))) + "\n")
+        build_wordlist(src, idx)
+        with Wordlist(idx) as words:
+            _record("generate/passphrase-wordlist",
+                    _measure(lambda _: app.generate_passphrase(6, words=words), range(1000)))
+    # Target-strength mode: candidates drawn until the score / guess target is met
+    _record("generate/password@85", _measure(lambda _: app.generate_password(16, min_score=85), range(1000)))
+    _record("generate/passphrase@70", _measure(
+        lambda _: app.generate_passphrase(4, capitalize=True, min_score=70, min_guesses_log10=12), range(1000)))
+
+
+def bench_profile() -> None:
+    # Per-stage breakdown of evaluate_password, and what enabling it costs
+    import profiling
+
+    corpus = _random_corpus(2000, 8, 16)
+    _record("profile/off", _measure(app.evaluate_password, corpus))
+    with profiling.profile() as prof:
+        _record("profile/on", _measure(app.evaluate_password, corpus))
+    print(prof.format_table())
+
+
+def bench_aggregate() -> None:
+    from aggregate import AuditSummary
+
+    corpus = _random_corpus(5000, 6, 24) + _passphrase_corpus(5000)
+    pairs = [(app.evaluate_password(p), p) for p in corpus]
+    summary = AuditSummary()
+    _record("aggregate/add", _measure(lambda pair: summary.add(*pair), pairs))
+    parts = []
+    for i in range(0, len(pairs), 1000):
+        part = AuditSummary()
+        part.add_many(r for r, _ in pairs[i:i + 1000])
+        parts.append(part)
+    _record("aggregate/merge", _measure(lambda part: AuditSummary().merge(part), parts))
+
+
+def _multi_pass_features(password: str) -> tuple:
+    # Feature gathering as evaluate_password did it before _extract_features:
+    # one generator / C call per feature
+    lower_p = password.lower()
+    seqs = 0
+    for i in range(len(password) - 2):
+        a, b, c = password[i:i + 3]
+        if (a.isalpha() and b.isalpha() and c.isalpha()
+                and ord(b) == ord(a) + 1 and ord(c) == ord(b) + 1):
+            seqs += 1
+        elif (a.isdigit() and b.isdigit() and c.isdigit()
+                and ord(b) == ord(a) + 1 and ord(c) == ord(b) + 1):
+            seqs += 1
+    # Descending sequences, repeats and keyboard walks as further scans
+    for i in range(len(password) - 2):
+        a, b, c = password[i:i + 3]
+        if ((a.isalpha() and b.isalpha() and c.isalpha() or a.isdigit() and b.isdigit() and c.isdigit())
+                and ord(b) == ord(a) - 1 and ord(c) == ord(b) - 1):
+            seqs += 1
+    repeats = sum(1 for i in range(len(password) - 2) if password[i] == password[i + 1] == password[i + 2])
+    walks = sum(1 for i in range(len(password) - 3) if app._is_walk(*password[i:i + 4]))
+    return (
+        any(c.islower() for c in password),
+        any(c.isupper() for c in password),
+        any(c.isdigit() for c in password),
+        any(c in app.SAFE_SYMBOLS for c in password),
+        password.isalpha(),
+        password.isdigit(),
+        len(set(password)),
+        seqs,
+        walks,
+        repeats,
+        lower_p,
+        app._deleet(lower_p),
+    )
+
+
+def bench_features() -> None:
+    for name, corpus in (
+        ("short", _random_corpus(2000, 8, 16)),
+        ("long", _random_corpus(200, 64, 64)),
+        ("1k", _random_corpus(20, 1000, 1000)),
+    ):
+        old = _time_per_call(_multi_pass_features, corpus)
+        new = _time_per_call(app._extract_features, corpus)
+        _record(f"features/{name}", _measure(app._extract_features, corpus))
+        print(f"  fused {new:.1f} us/call vs. multi-pass {old:.1f} us ({old / new:.1f}x)")
+
+
+def bench_vectorized() -> None:
+    try:
+        import vectorized
+        vectorized._require_numpy()
+    except ImportError as exc:
+        print(f"vectorized                       skipped ({exc})")
+        return
+    rng = random.Random(SEED)
+    words = sorted(app.COMMON_WORDS | app.COMMON_PASSWORDS)
+    corpus = _random_corpus(40000, 4, 24)
+    corpus += [rng.choice(words) + "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 4)))
+               for _ in range(20000)]
+    corpus += [app._deleet(w).upper() for w in words] + ["", "héllo", "x" * 200]
+
+    start = time.perf_counter()
+    batch = vectorized.score_batch(corpus)
+    vec_us = (time.perf_counter() - start) / len(corpus) * 1e6
+    # Like for like: score_batch computes no guess estimate, so neither does
+    # the scalar baseline
+    start = time.perf_counter()
+    expected = [app.evaluate_password(p, guesses=False) for p in corpus]
+    scalar_us = (time.perf_counter() - start) / len(corpus) * 1e6
+
+    mismatches = sum(
+        1 for i, res in enumerate(expected)
+        if (res["score"], res["entropy_bits"], res["label"], res["color"])
+        != (batch["score"][i], batch["entropy_bits"][i], batch["label"][i], batch["color"][i])
+    )
+    RESULTS["vectorized/score_batch"] = {
+        "ops_per_sec": round(1e6 / vec_us, 1),
+        "scalar_ops_per_sec": round(1e6 / scalar_us, 1),
+        "mismatches": mismatches,
+    }
+    print(f"{'vectorized/score_batch':32} {1e6 / vec_us:12.1f} rows/s "
+          f"(scalar {1e6 / scalar_us:.1f}, {scalar_us / vec_us:.1f}x), mismatches: {mismatches}")
+
+
+def _http_load(port: int, connections: int, requests_each: int, body: bytes) -> list:
+    import asyncio
+
+    request = (
+        "POST /evaluate HTTP/1.1\r\nHost: localhost\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode("latin-1") + body
+
+    async def client() -> list:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        latencies = []
+        for _ in range(requests_each):
+            start = time.perf_counter()
+            writer.write(request)
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+        return latencies
+
+    async def run() -> list:
+        parts = await asyncio.gather(*(client() for _ in range(connections)))
+        return [x for part in parts for x in part]
+
+    return asyncio.run(run())
+
+
+def _cold_start(cmd: list, runs: int = 10, stdin: bytes = b"") -> dict:
+    # Wall-clock time of fresh interpreter processes, interpreter start included
+    here = os.path.dirname(os.path.abspath(__file__))
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter_ns()
+        proc = subprocess.run(cmd, input=stdin, cwd=here, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        latencies.append(time.perf_counter_ns() - start)
+        if proc.returncode != 0:
+            return None
+    return _summarise(latencies)
+
+
+def bench_startup() -> None:
+    py = sys.executable
+    first_paint = (
+        "import gui; g = gui.PasswordCheckerApp(); g.update(); g._on_close()"
+    )
+    for name, cmd, stdin in (
+        ("python", [py, "-c", "pass"], b""),
+        ("import", [py, "-c", "import app"], b""),
+        ("cli-generate", [py, "app.py", "generate", "-n", "1"], b""),
+        ("cli-audit", [py, "app.py", "audit", "-", "-j", "1"], b"Tr0ub4dor&3\n"),
+        ("gui-first-paint", [py, "-c", first_paint], b""),
+    ):
+        stats = _cold_start(cmd, stdin=stdin)
+        if stats is None:
+            print(f"{'startup/' + name:32} skipped (command failed)")
+            continue
+        _record(f"startup/{name}", stats)
+
+
+def bench_serve() -> None:
+    import socket
+    import urllib.request
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    proc = subprocess.Popen(
+        [sys.executable, "app.py", "serve", "--port", str(port)],
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+                break
+            except OSError:
+                if time.time() > deadline or proc.poll() is not None:
+                    print("serve                            skipped (server did not start)")
+                    return
+                time.sleep(0.1)
+        body = json.dumps({"password": "Tr0ub4dor&3"}).encode("utf-8")
+        connections, each = 32, 200
+        start = time.perf_counter()
+        latencies = _http_load(port, connections, each, body)
+        elapsed = time.perf_counter() - start
+        stats = _summarise([int(x * 1e9) for x in latencies])
+        # Concurrent clients: throughput is requests over wall time
+        stats["ops_per_sec"] = round(len(latencies) / elapsed, 1)
+        _record(f"serve/evaluate@{connections}", stats)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+SHARED_WORKERS = 16
+SHARED_WORDS = 50000
+
+
+def _proc_memory() -> dict:
+    # This process's memory in MiB (Linux); Pss splits shared pages between
+    # the processes mapping them, so summing it over workers is fair
+    fields = {}
+    for path, keys in (("/proc/self/status", ("VmRSS", "RssAnon", "RssShmem")),
+                       ("/proc/self/smaps_rollup", ("Pss",))):
+        with open(path) as fh:
+            for line in fh:
+                name, _, value = line.partition(":")
+                if name in keys:
+                    fields[name] = int(value.split()[0]) / 1024.0
+    return {"rss_mb": fields.get("VmRSS", 0.0), "anon_mb": fields.get("RssAnon", 0.0),
+            "shmem_mb": fields.get("RssShmem", 0.0), "pss_mb": fields.get("Pss", 0.0)}
+
+
+def _shared_worker_probe(reports, words_path: str, shared_name: str) -> None:
+    # Pool initializer: load or attach like an audit worker, score a little
+    # so the dictionaries are actually touched, then report
+    import audit
+
+    start = time.perf_counter_ns()
+    audit._init_worker(words_path, None, shared_name)
+    elapsed = time.perf_counter_ns() - start
+    for password in _random_corpus(2000, 6, 20):
+        app.evaluate_password(password)
+    reports.put((elapsed, _proc_memory()))
+
+
+def bench_shared() -> None:
+    import multiprocessing
+    import tempfile
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print(f"{'shared':32} skipped (needs /proc/self/smaps_rollup)")
+        return
+    import shareddict
+
+    rng = random.Random(SEED)
+    letters = string.ascii_lowercase
+    words = {"".join(rng.choice(letters) for _ in range(rng.randint(5, 10))) for _ in range(SHARED_WORDS)}
+    # Fresh interpreters, so neither mode inherits dictionaries from this process
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        words_path = os.path.join(tmp, "words.txt")
+        with open(words_path, "w", encoding="utf-8") as fh:
+            fh.write("\n".join(sorted(words)) + "\n")
+        for mode in ("copy", "shared"):
+            shared = shareddict.SharedDictionaries(words_path) if mode == "shared" else None
+            reports = ctx.Queue()
+            pool = ctx.Pool(SHARED_WORKERS, _shared_worker_probe,
+                            (reports, words_path, shared.name if shared else None))
+            try:
+                results = [reports.get(timeout=600) for _ in range(SHARED_WORKERS)]
+            finally:
+                pool.terminate()
+                pool.join()
+                if shared is not None:
+                    shared.close()
+            stats = _summarise([ns for ns, _ in results])
+            memory = [mem for _, mem in results]
+            for key in ("rss_mb", "anon_mb", "pss_mb"):
+                stats[key] = round(sum(m[key] for m in memory) / len(memory), 1)
+            stats["total_pss_mb"] = round(sum(m["pss_mb"] for m in memory), 1)
+            if shared is not None:
+                stats["segment_mb"] = round(shared.size / 2 ** 20, 1)
+            _record(f"shared/attach-{mode}", stats)
+            print(f"{'':32} per worker: rss {stats['rss_mb']:.1f} MiB, anon {stats['anon_mb']:.1f} MiB, "
+                  f"pss {stats['pss_mb']:.1f} MiB; {SHARED_WORKERS} workers pss {stats['total_pss_mb']:.1f} MiB")
+
+
+def _start_virtual_display():
+    # Headless machines: run Tk against Xvfb when it is installed
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        return None
+    display = f":{90 + os.getpid() % 100}"
+    proc = subprocess.Popen([xvfb, display, "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    if proc.poll() is not None:
+        return None
+    os.environ["DISPLAY"] = display
+    return proc
+
+
+def bench_ui() -> None:
+    try:
+        import tkinter as tk
+
+        import gui as gui_module
+    except ImportError as exc:
+        print(f"ui                               skipped ({exc})")
+        return
+
+    xvfb = _start_virtual_display()
+    try:
+        try:
+            gui = gui_module.PasswordCheckerApp()
+        except tk.TclError as exc:
+            print(f"ui                               skipped ({exc})")
+            return
+        try:
+            _bench_ui(gui)
+        finally:
+            gui._on_close()
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+
+def _bench_ui(gui) -> None:
+    gui.DEBOUNCE_MS = 0  # time the work, not the debounce window
+    while gui.evaluator is None:  # built by the worker after the first paint
+        gui.update()
+    applied = []
+    update_ui = gui._update_ui
+
+    def traced_update(result: dict) -> None:
+        update_ui(result)
+        applied.append(result)
+
+    gui._update_ui = traced_update
+
+    # Keystroke -> background evaluation -> _update_ui -> redraw
+    typed = "Correct-Horse-Battery-Staple-42!"
+    latencies = []
+    for _ in range(5):
+        gui.password_var.set("")
+        gui.evaluator.reset()
+        for ch in typed:
+            gui.password_var.set(gui.password_var.get() + ch)
+            start = time.perf_counter_ns()
+            applied.clear()
+            gui._on_password_change(object())
+            while not applied:
+                gui.update()
+            gui.update_idletasks()
+            latencies.append(time.perf_counter_ns() - start)
+    _record("ui/keystroke", _summarise(latencies))
+
+    # _update_ui alone, alternating between results so every widget changes
+    results = [app.evaluate_password(p) for p in ("", "abc", "Tr0ub4dor&3", typed, "password1")]
+
+    def apply(result: dict) -> None:
+        update_ui(result)
+        gui.update_idletasks()
+
+    _record("ui/update_ui", _measure(apply, results))
+    # Typing inside one strength band: mostly identical renders
+    _record("ui/update_ui_unchanged", _measure(apply, results[2:3] * 5))
+
+
+CASES = {
+    "evaluate": bench_evaluate,
+    "generate": bench_generate,
+    "features": bench_features,
+    "profile": bench_profile,
+    "aggregate": bench_aggregate,
+    "guesses": bench_guesses,
+    "vectorized": bench_vectorized,
+    "serve": bench_serve,
+    "shared": bench_shared,
+    "startup": bench_startup,
+    "ui": bench_ui,
+}
+
+
+def check_regressions(baseline: dict, results: dict, threshold: float) -> list:
+    # (name, ratio) for throughput more than `threshold` below the baseline;
+    # results that disagree with the scalar scorer always count
+    regressions = []
+    for name, stats in results.items():
+        if stats.get("mismatches"):
+            regressions.append((name, 0.0))
+            continue
+        base = baseline.get(name)
+        if not base or not base.get("ops_per_sec"):
+            continue
+        ratio = stats["ops_per_sec"] / base["ops_per_sec"]
+        if ratio < 1.0 - threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(prog="bench.py", description="Benchmarks and regression check.")
+    parser.add_argument("cases", nargs="*", help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--save-baseline", metavar="FILE", help="write results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed throughput drop vs. baseline (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    for name in args.cases:
+        if name not in CASES:
+            print(f"Unknown case {name!r}; choose from {', '.join(CASES)}", file=sys.stderr)
+            return 2
+    for name in args.cases or list(CASES):
+        CASES[name]()
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(RESULTS, f, indent=2, sort_keys=True)
+            f.write("\n")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = check_regressions(baseline, RESULTS, args.threshold)
+        for name, ratio in regressions:
+            print(f"REGRESSION {name}: {ratio:.2f}x of baseline throughput", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} of baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
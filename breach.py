@@ -0,0 +1,217 @@
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import struct
+import tempfile
+
+
+# ---------------------------
+# Breached-password index
+# ---------------------------
+#
+# Index file: a fixed header followed by sorted, de-duplicated, fixed-width
+# records, each the first `width` bytes of SHA-1(password). Lookups mmap the
+# file and binary-search it, so nothing is loaded into Python objects.
+#
+# Optional Bloom filter (<index>.bloom): bit positions are derived from the
+# stored prefix itself, so the filter can be rebuilt from the index alone.
+
+INDEX_MAGIC = b"LSGBRCH1"
+INDEX_HEADER = struct.Struct("<8sIQ")  # magic, record width, record count
+BLOOM_MAGIC = b"LSGBLOM1"
+BLOOM_HEADER = struct.Struct("<8sQI")  # magic, bit count, hash count
+
+DEFAULT_WIDTH = 8
+MIN_WIDTH = 8
+# Records held in memory per sorted run while building
+DEFAULT_RUN_SIZE = 4_000_000
+
+
+def _hash_key(password: bytes, width: int) -> bytes:
+    return hashlib.sha1(password).digest()[:width]
+
+
+def _parse_sha1_line(line: bytes, width: int) -> bytes:
+    # Accepts "HEX" or "HEX:COUNT" (as published by breach-checking services)
+    hexpart = line.split(b":", 1)[0].strip()
+    return bytes.fromhex(hexpart.decode("ascii"))[:width]
+
+
+def _write_run(keys: list, directory: str) -> str:
+    keys.sort()
+    fd, path = tempfile.mkstemp(prefix="run-", suffix=".bin", dir=directory)
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(b"".join(keys))
+    return path
+
+
+def _read_run(path: str, width: int):
+    with open(path, "rb") as fh:
+        while True:
+            block = fh.read(width * 65536)
+            if not block:
+                return
+            for i in range(0, len(block), width):
+                yield block[i:i + width]
+
+
+def _bloom_positions(key: bytes, nbits: int, nhashes: int):
+    # Double hashing (Kirsch–Mitzenmacher) over two independent 32-bit slices
+    h1 = int.from_bytes(key[:4], "little")
+    h2 = int.from_bytes(key[4:8], "little") | 1
+    for i in range(nhashes):
+        yield (h1 + i * h2) % nbits
+
+
+def build_index(sources, dst: str, width: int = DEFAULT_WIDTH, sha1_input: bool = False,
+                bloom_bits_per_item: int = 0, run_size: int = DEFAULT_RUN_SIZE) -> int:
+    # Streams every source file once, writes sorted runs to a temporary
+    # directory next to `dst`, then k-way merges them. Memory is bounded by
+    # `run_size` records regardless of corpus size. Returns the record count.
+    width = max(MIN_WIDTH, min(20, int(width)))
+    if isinstance(sources, (str, os.PathLike)):
+        sources = [sources]
+    workdir = tempfile.mkdtemp(prefix="lasanga-breach-", dir=os.path.dirname(os.path.abspath(dst)))
+    runs = []
+    try:
+        keys = []
+        for src in sources:
+            with open(src, "rb") as fh:
+                for line in fh:
+                    line = line.rstrip(b"\r\n")
+                    if not line:
+                        continue
+                    if sha1_input:
+                        try:
+                            keys.append(_parse_sha1_line(line, width))
+                        except ValueError:
+                            continue
+                    else:
+                        keys.append(_hash_key(line, width))
+                    if len(keys) >= run_size:
+                        runs.append(_write_run(keys, workdir))
+                        keys = []
+        if keys:
+            runs.append(_write_run(keys, workdir))
+        keys = []
+
+        count = 0
+        with open(dst, "wb") as out:
+            out.write(INDEX_HEADER.pack(INDEX_MAGIC, width, 0))
+            last = None
+            for key in heapq.merge(*(_read_run(r, width) for r in runs)):
+                if key == last or len(key) != width:
+                    continue
+                out.write(key)
+                last = key
+                count += 1
+            out.seek(0)
+            out.write(INDEX_HEADER.pack(INDEX_MAGIC, width, count))
+    finally:
+        for r in runs:
+            try:
+                os.remove(r)
+            except OSError:
+                pass
+        try:
+            os.rmdir(workdir)
+        except OSError:
+            pass
+
+    if bloom_bits_per_item:
+        build_bloom(dst, bits_per_item=bloom_bits_per_item)
+    return count
+
+
+def build_bloom(index_path: str, bits_per_item: int = 10, bloom_path: str = None) -> str:
+    bloom_path = bloom_path or index_path + ".bloom"
+    index = BreachIndex(index_path, bloom_path=False)
+    try:
+        nbits = max(64, index.count * int(bits_per_item))
+        nhashes = max(1, round(bits_per_item * math.log(2)))
+        bits = bytearray((nbits + 7) // 8)
+        for key in index.keys():
+            for pos in _bloom_positions(key, nbits, nhashes):
+                bits[pos >> 3] |= 1 << (pos & 7)
+    finally:
+        index.close()
+    with open(bloom_path, "wb") as out:
+        out.write(BLOOM_HEADER.pack(BLOOM_MAGIC, nbits, nhashes))
+        out.write(bits)
+    return bloom_path
+
+
+class BreachIndex:
+    def __init__(self, path: str, bloom_path=None) -> None:
+        # bloom_path: None = use "<path>.bloom" if present, False = never
+        self.path = path
+        self._fh = open(path, "rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.width, self.count = INDEX_HEADER.unpack_from(self._mm, 0)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a breach index")
+        self._base = INDEX_HEADER.size
+
+        self._bloom_fh = None
+        self._bloom = None
+        if bloom_path is None:
+            candidate = path + ".bloom"
+            bloom_path = candidate if os.path.exists(candidate) else False
+        if bloom_path:
+            self._bloom_fh = open(bloom_path, "rb")
+            self._bloom = mmap.mmap(self._bloom_fh.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self._nbits, self._nhashes = BLOOM_HEADER.unpack_from(self._bloom, 0)
+            if magic != BLOOM_MAGIC:
+                self.close()
+                raise ValueError(f"{bloom_path}: not a bloom filter")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, password) -> bool:
+        if isinstance(password, str):
+            password = password.encode("utf-8", "surrogateescape")
+        return self.contains_key(_hash_key(password, self.width))
+
+    def contains_key(self, key: bytes) -> bool:
+        if self._bloom is not None:
+            bloom, base = self._bloom, BLOOM_HEADER.size
+            for pos in _bloom_positions(key, self._nbits, self._nhashes):
+                if not bloom[base + (pos >> 3)] & (1 << (pos & 7)):
+                    return False
+        mm, width, base = self._mm, self.width, self._base
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            off = base + mid * width
+            rec = mm[off:off + width]
+            if rec < key:
+                lo = mid + 1
+            elif rec > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def keys(self):
+        mm, width = self._mm, self.width
+        end = self._base + self.count * width
+        for off in range(self._base, end, width):
+            yield mm[off:off + width]
+
+    def close(self) -> None:
+        for res in (self._mm, self._fh, getattr(self, "_bloom", None), getattr(self, "_bloom_fh", None)):
+            if res is not None:
+                try:
+                    res.close()
+                except Exception:
+                    pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
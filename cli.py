@@ -0,0 +1,245 @@
+import argparse
+import math
+import sys
+import time
+
+
+# ---------------------------
+# Command-line entry points
+# ---------------------------
+
+def _open_output(path: str):
+    # Passwords read with surrogateescape (bytes that are not UTF-8) are
+    # written back as the original bytes
+    if not path or path == "-":
+        reconfigure = getattr(sys.stdout, "reconfigure", None)
+        if reconfigure is not None:
+            reconfigure(errors="surrogateescape")
+        return sys.stdout, False
+    return open(path, "w", encoding="utf-8", errors="surrogateescape", newline=""), True
+
+
+def _cmd_audit(args) -> int:
+    from audit import run_audit
+
+    fmt = args.format
+    if fmt is None:
+        output = (args.output or "").lower()
+        fmt = "csv" if output.endswith(".csv") else "summary" if output.endswith(".json") else "jsonl"
+    cache = None
+    if args.cache:
+        from resultcache import ResultCache, ruleset_fingerprint
+
+        cache = ResultCache(args.cache, ruleset_fingerprint(args.words, args.breach_index),
+                            max_entries=args.cache_size)
+    out, close = _open_output(args.output)
+    start = time.perf_counter()
+    try:
+        count = run_audit(
+            args.file,
+            out,
+            fmt=fmt,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            include_password=args.include_password,
+            words_path=args.words,
+            breach_path=args.breach_index,
+            cache=cache,
+        )
+    finally:
+        if close:
+            out.close()
+        if cache is not None:
+            cache.close()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Audited {count} passwords in {elapsed:.2f}s ({rate:,.0f} passwords/sec)", file=sys.stderr)
+    if cache is not None:
+        print(f"Cache: {cache.hits} hits, {cache.misses} scored, {len(cache)} entries", file=sys.stderr)
+    return 0
+
+
+def _cmd_breach_index(args) -> int:
+    from breach import build_index
+
+    start = time.perf_counter()
+    count = build_index(
+        args.sources,
+        args.output,
+        width=args.width,
+        sha1_input=args.sha1_input,
+        bloom_bits_per_item=args.bloom_bits,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"Indexed {count} unique entries into {args.output} in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+def _cmd_serve(args) -> int:
+    from server import run_server
+
+    run_server(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        max_concurrency=args.max_concurrency,
+        words_path=args.words,
+        breach_path=args.breach_index,
+    )
+    return 0
+
+
+def _cmd_generate(args) -> int:
+    import generation
+
+    if args.output and args.output != "-":
+        out, close = open(args.output, "wb"), True
+    else:
+        out, close = sys.stdout.buffer, False
+    target = dict(
+        min_score=args.min_score,
+        min_guesses_log10=math.log10(max(1.0, args.min_guesses)) if args.min_guesses is not None else None,
+    )
+    words = None
+    if args.passphrase:
+        from app import passphrase_words
+
+        if args.wordlist:
+            from wordlist import Wordlist
+
+            words = Wordlist(args.wordlist)
+        else:
+            words = passphrase_words()
+    start = time.perf_counter()
+    try:
+        if args.passphrase:
+            count = generation.write_passphrases(
+                out,
+                args.count,
+                workers=args.workers,
+                num_words=args.words,
+                separator=args.separator,
+                capitalize=args.caps,
+                add_number=not args.no_number,
+                words=words,
+                **target,
+            )
+        else:
+            count = generation.write_passwords(out, args.count, length=args.length, workers=args.workers,
+                                               **target)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    finally:
+        if close:
+            out.close()
+        else:
+            out.flush()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Generated {count} in {elapsed:.2f}s ({rate:,.0f}/sec)", file=sys.stderr)
+    if words is not None:
+        from app import passphrase_entropy
+
+        bits = passphrase_entropy(args.words, len(words), add_number=not args.no_number)
+        bound = " at most" if args.min_score is not None or args.min_guesses is not None else ""
+        print(f"Entropy:{bound} {bits:.1f} bits each ({max(3, min(10, args.words))} words "
+              f"from {len(words):,})", file=sys.stderr)
+    return 0
+
+
+def _cmd_wordlist(args) -> int:
+    from wordlist import build_wordlist
+
+    start = time.perf_counter()
+    count, duplicates = build_wordlist(args.sources, args.output)
+    elapsed = time.perf_counter() - start
+    if not count:
+        print("No words found.", file=sys.stderr)
+        return 1
+    print(f"Indexed {count} words into {args.output} in {elapsed:.2f}s ({duplicates} duplicates dropped, "
+          f"{math.log2(count):.2f} bits per word)", file=sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="app.py", description="lasanga – Password Strength Checker")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    audit = sub.add_parser("audit", help="Score a file of passwords (one per line) without the GUI.")
+    audit.add_argument("file", help="Password file, or '-' for stdin.")
+    audit.add_argument("-o", "--output", help="Output file (default: stdout).")
+    audit.add_argument("-f", "--format", choices=("jsonl", "csv", "summary"),
+                       help="Output format: a row per password, or one aggregate JSON report "
+                            "(default: from output extension, .csv / .json, else jsonl).")
+    audit.add_argument("-j", "--workers", type=int, default=None,
+                       help="Worker processes (default: all cores).")
+    audit.add_argument("--chunk-size", type=int, default=2000,
+                       help="Passwords per batch sent to a worker.")
+    audit.add_argument("--include-password", action="store_true",
+                       help="Include the plaintext password in each output row.")
+    audit.add_argument("--words", metavar="FILE",
+                       help="Extra dictionary words (one per line) for the substring check.")
+    audit.add_argument("--breach-index", metavar="INDEX",
+                       help="Breach index built with `app.py breach-index`.")
+    audit.add_argument("--cache", metavar="DB",
+                       help="SQLite result cache; repeat runs only score new or changed entries.")
+    audit.add_argument("--cache-size", type=int, default=1_000_000, metavar="N",
+                       help="Most entries kept in the cache (least recently used are evicted).")
+    audit.set_defaults(func=_cmd_audit)
+
+    breach = sub.add_parser("breach-index", help="Build a compact, mmap-able breached-password index.")
+    breach.add_argument("sources", nargs="+", help="Corpus files, one password (or SHA-1 hex) per line.")
+    breach.add_argument("-o", "--output", required=True, help="Index file to write.")
+    breach.add_argument("--width", type=int, default=8,
+                        help="Bytes of SHA-1 kept per entry (8-20, default 8).")
+    breach.add_argument("--sha1-input", action="store_true",
+                        help="Sources contain SHA-1 hex digests (optionally HASH:COUNT) instead of plaintext.")
+    breach.add_argument("--bloom-bits", type=int, default=10,
+                        help="Bloom filter bits per entry; 0 disables the filter.")
+    breach.set_defaults(func=_cmd_breach_index)
+
+    words = sub.add_parser("wordlist", help="Build an indexed passphrase wordlist (deduplicated, mmap-able).")
+    words.add_argument("sources", nargs="+", help="Word files: one word per line, or EFF-style 'DICE<TAB>word'.")
+    words.add_argument("-o", "--output", required=True, help="Index file to write.")
+    words.set_defaults(func=_cmd_wordlist)
+
+    serve = sub.add_parser("serve", help="Run a local HTTP/JSON scoring service.")
+    serve.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1).")
+    serve.add_argument("--port", type=int, default=8765, help="Port to bind (default: 8765).")
+    serve.add_argument("-j", "--workers", type=int, default=None,
+                       help="Scoring worker processes (default: all cores).")
+    serve.add_argument("--max-concurrency", type=int, default=64,
+                       help="Requests scored at once; the rest wait their turn.")
+    serve.add_argument("--words", metavar="FILE",
+                       help="Extra dictionary words (one per line) for the substring check.")
+    serve.add_argument("--breach-index", metavar="INDEX",
+                       help="Breach index built with `app.py breach-index`.")
+    serve.set_defaults(func=_cmd_serve)
+
+    gen = sub.add_parser("generate", help="Generate passwords or passphrases in bulk.")
+    gen.add_argument("-n", "--count", type=int, required=True, help="How many to generate.")
+    gen.add_argument("-o", "--output", help="Output file (default: stdout).")
+    gen.add_argument("--length", type=int, default=16, help="Password length, 8-64 (default: 16).")
+    gen.add_argument("--passphrase", action="store_true", help="Generate passphrases instead.")
+    gen.add_argument("--words", type=int, default=4, help="Words per passphrase, 3-10 (default: 4).")
+    gen.add_argument("--separator", default="-", help="Passphrase word separator (default: '-').")
+    gen.add_argument("--caps", action="store_true", help="Capitalize passphrase words.")
+    gen.add_argument("--no-number", action="store_true", help="Do not append two digits to passphrases.")
+    gen.add_argument("--wordlist", metavar="INDEX",
+                     help="Passphrase words from an index built with `app.py wordlist` "
+                          "(default: $LASAGNA_WORDLIST, else the built-in list).")
+    gen.add_argument("--min-score", type=int, metavar="N",
+                     help="Only output candidates scoring at least N (0-100).")
+    gen.add_argument("--min-guesses", type=float, metavar="N",
+                     help="Only output candidates with at least N estimated guesses (e.g. 1e12).")
+    gen.add_argument("-j", "--workers", type=int, default=1,
+                     help="Worker processes (default: 1).")
+    gen.set_defaults(func=_cmd_generate)
+
+    return parser
+
+
+def run(argv: list) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args) or 0
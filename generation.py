@@ -0,0 +1,196 @@
+import os
+import re
+import string
+
+from app import MAX_GENERATE_ATTEMPTS, SAFE_SYMBOLS, meets_target, passphrase_words
+
+
+# ---------------------------
+# Bulk password / passphrase generation
+# ---------------------------
+#
+# Randomness comes from large os.urandom buffers. Bytes are mapped onto the
+# alphabet with rejection sampling (bytes past the largest multiple of the
+# alphabet size are dropped), so every character is uniformly likely. Whole
+# candidates missing a character category are rejected, which keeps the
+# "every category at least once" guarantee of generate_password while
+# staying uniform over all valid passwords.
+#
+# A target (min_score / min_guesses_log10) filters each block through
+# app.meets_target the same way, so output stays uniform over the
+# candidates that reach it.
+
+PASSWORD_ALPHABET = (string.ascii_lowercase + string.ascii_uppercase + string.digits + SAFE_SYMBOLS).encode("ascii")
+BLOCK_SIZE = 65536
+
+_ALPHABET_LIMIT = 256 - 256 % len(PASSWORD_ALPHABET)
+# Single bytes.translate() call maps accepted bytes to characters and drops the rest
+_BYTE_TO_CHAR = bytes(PASSWORD_ALPHABET[b % len(PASSWORD_ALPHABET)] for b in range(256))
+_REJECTED_BYTES = bytes(range(_ALPHABET_LIMIT, 256))
+# Matches a candidate containing every category; evaluated in C via filter()
+_SYMBOL_CLASS = re.escape(SAFE_SYMBOLS.encode("ascii"))
+_HAS_ALL_CATEGORIES = re.compile(
+    rb"(?=[^a-z]*[a-z])(?=[^A-Z]*[A-Z])(?=[^0-9]*[0-9])(?=[^" + _SYMBOL_CLASS + rb"]*[" + _SYMBOL_CLASS + rb"])"
+)
+_DIGIT_LIMIT = 250
+_BYTE_TO_DIGIT = bytes(48 + b % 10 for b in range(256))
+_REJECTED_DIGIT_BYTES = bytes(range(_DIGIT_LIMIT, 256))
+
+
+def _clamp_length(length: int) -> int:
+    return max(8, min(64, int(length)))
+
+
+def _valid_fraction(length: int) -> float:
+    # Probability that a uniform candidate contains every category
+    sizes = [26, 26, 10, len(SAFE_SYMBOLS)]
+    total = sum(sizes)
+    prob = 0.0
+    for mask in range(16):
+        missing = sum(s for i, s in enumerate(sizes) if mask >> i & 1)
+        sign = -1 if bin(mask).count("1") % 2 else 1
+        prob += sign * ((total - missing) / total) ** length
+    return prob
+
+
+def _target(min_score: int, min_guesses_log10: float) -> dict:
+    target = {}
+    if min_score is not None:
+        target["min_score"] = min_score
+    if min_guesses_log10 is not None:
+        target["min_guesses_log10"] = min_guesses_log10
+    return target
+
+
+def _keep_strong(candidates: list, target: dict, misses: int, decode=None) -> tuple:
+    # (candidates reaching the target, candidates rejected since the last hit)
+    if not target:
+        return candidates, 0
+    kept = [c for c in candidates if meets_target(decode(c) if decode else c, **target)]
+    misses = 0 if kept else misses + len(candidates)
+    if misses >= MAX_GENERATE_ATTEMPTS:
+        raise ValueError("No candidate reached the requested strength; use longer output or a lower target.")
+    return kept, misses
+
+
+def iter_password_blocks(count: int, length: int = 16, block_size: int = BLOCK_SIZE,
+                         min_score: int = None, min_guesses_log10: float = None):
+    # Yields newline-terminated blocks of ASCII passwords (bytes); `count` total
+    length = _clamp_length(length)
+    remaining = max(0, int(count))
+    accept = _ALPHABET_LIMIT / 256 * _valid_fraction(length)
+    split = re.compile(rb".{%d}" % length, re.DOTALL)
+    target = _target(min_score, min_guesses_log10)
+    misses = 0
+    while remaining:
+        want = min(remaining, block_size)
+        chars = os.urandom(int(want * length / accept * 1.05) + 4 * length)
+        chars = chars.translate(_BYTE_TO_CHAR, _REJECTED_BYTES)
+        out = list(filter(_HAS_ALL_CATEGORIES.match, split.findall(chars)))[:want]
+        out, misses = _keep_strong(out, target, misses, decode=bytes.decode)
+        if out:
+            remaining -= len(out)
+            out.append(b"")
+            yield b"\n".join(out)
+
+
+def generate_passwords(count: int, length: int = 16, **kwargs):
+    for block in iter_password_blocks(count, length, **kwargs):
+        yield from block.decode("ascii").splitlines()
+
+
+def _random_indexes(upper: int, count: int):
+    # `count` uniform integers in [0, upper) from 32-bit draws with rejection
+    limit = (1 << 32) - (1 << 32) % upper
+    produced = 0
+    while produced < count:
+        need = count - produced
+        values = memoryview(os.urandom(4 * (need + need // 8 + 8))).cast("I")
+        for v in values:
+            if v < limit:
+                yield v % upper
+                produced += 1
+                if produced == count:
+                    return
+
+
+def _random_digits(count: int) -> bytes:
+    out = b""
+    while len(out) < count:
+        raw = os.urandom(count + count // 16 + 8)
+        out += raw.translate(_BYTE_TO_DIGIT, _REJECTED_DIGIT_BYTES)
+    return out[:count]
+
+
+def iter_passphrase_blocks(count: int, num_words: int = 4, separator: str = "-",
+                           capitalize: bool = False, add_number: bool = True,
+                           words: list = None, block_size: int = BLOCK_SIZE,
+                           min_score: int = None, min_guesses_log10: float = None):
+    # Same shape as generate_passphrase; yields newline-terminated str blocks.
+    # `words` may be a wordlist.Wordlist: only the picked words are read.
+    words = words if words is not None else passphrase_words()
+    num_words = max(3, min(10, int(num_words)))
+    remaining = max(0, int(count))
+    target = _target(min_score, min_guesses_log10)
+    misses = 0
+    while remaining:
+        n = min(remaining, block_size)
+        picks = [words[i] for i in _random_indexes(len(words), n * num_words)]
+        if capitalize:
+            picks = [w.capitalize() for w in picks]
+        join = separator.join
+        if add_number:
+            digits = _random_digits(2 * n).decode("ascii")
+            lines = [
+                f"{join(picks[k * num_words:(k + 1) * num_words])}{separator}{digits[2 * k:2 * k + 2]}"
+                for k in range(n)
+            ]
+        else:
+            lines = [join(picks[k * num_words:(k + 1) * num_words]) for k in range(n)]
+        lines, misses = _keep_strong(lines, target, misses)
+        if lines:
+            remaining -= len(lines)
+            lines.append("")
+            yield "\n".join(lines)
+
+
+def generate_passphrases(count: int, **kwargs):
+    for block in iter_passphrase_blocks(count, **kwargs):
+        yield from block.splitlines()
+
+
+def _password_block(args: tuple) -> bytes:
+    count, length, target = args
+    return b"".join(iter_password_blocks(count, length, **target))
+
+
+def _passphrase_block(args: tuple) -> bytes:
+    count, kwargs = args
+    return "".join(iter_passphrase_blocks(count, **kwargs)).encode("utf-8")
+
+
+def _write_blocks(out, count: int, workers: int, make_block, make_args) -> int:
+    # Blocks are independent, so worker processes can fill them; arguments
+    # are made lazily and only a few blocks per worker are in flight, so
+    # memory stays flat however large `count` is
+    from audit import _map_chunks
+
+    count = max(0, int(count))
+    if count <= BLOCK_SIZE:
+        workers = 1
+    args = (make_args(min(BLOCK_SIZE, count - i)) for i in range(0, count, BLOCK_SIZE))
+    written = 0
+    for block in _map_chunks(args, workers=workers or 1, func=make_block):
+        out.write(block)
+        written += block.count(b"\n")
+    return written
+
+
+def write_passwords(out, count: int, length: int = 16, workers: int = 1, **target) -> int:
+    # `out` is a binary stream; target: min_score / min_guesses_log10
+    return _write_blocks(out, count, workers, _password_block, lambda n: (n, length, target))
+
+
+def write_passphrases(out, count: int, workers: int = 1, **kwargs) -> int:
+    # `out` is a binary stream; kwargs as for iter_passphrase_blocks
+    return _write_blocks(out, count, workers, _passphrase_block, lambda n: (n, kwargs))
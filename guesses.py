@@ -0,0 +1,303 @@
+import datetime
+import math
+import re
+from functools import lru_cache
+
+from keyboard import LAYOUTS, QWERTY_ROWS
+from matching import LEET_MAP, MIN_DICT_WORD_LEN, AhoCorasick
+
+
+# ---------------------------
+# Pattern-based guess estimation
+# ---------------------------
+#
+# Finds dictionary, l33t, sequence, repeat, date and keyboard matches, then
+# picks the cheapest way to cover the password with matches plus brute-force
+# characters (dynamic programming over end positions, in log10 space). The
+# result approximates how many guesses a pattern-aware attacker needs, which
+# is far smaller than charset^length for passphrases and leetspeak words.
+
+BRUTEFORCE_CARDINALITY = 10
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+
+REFERENCE_YEAR = datetime.date.today().year
+MIN_YEAR_SPACE = 20
+DATE_MIN_YEAR = 1000
+DATE_MAX_YEAR = 2050
+
+_LOG10_BRUTEFORCE = math.log10(BRUTEFORCE_CARDINALITY)
+_MAX_REPEAT_BASE = 16
+_REPEAT_RE = re.compile(r"(.{1,%d}?)\1+" % _MAX_REPEAT_BASE, re.DOTALL)
+_DATE_SEP_RE = re.compile(r"(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})")
+_DIGITS_RE = re.compile(r"\d{4,}")
+
+
+# Keyboard walks are priced on the QWERTY layout (layouts live in keyboard.py)
+QWERTY_GRAPH = LAYOUTS["qwerty"][1]
+QWERTY_SHIFTED = frozenset(s for _, shifted in QWERTY_ROWS for s in shifted if s != " ")
+_KEYBOARD_STARTS = len(QWERTY_GRAPH) // 2
+_KEYBOARD_AVG_DEGREE = sum(len(v) for v in QWERTY_GRAPH.values()) / len(QWERTY_GRAPH) / 2
+
+
+@lru_cache(maxsize=4096)
+def _mixed_variations(special: int, total: int) -> int:
+    # Attempts needed to place `special` altered characters among `total`
+    other = total - special
+    if special <= 0:
+        return 1
+    if other <= 0:
+        return 2
+    return sum(math.comb(total, i) for i in range(1, min(special, other) + 1))
+
+
+@lru_cache(maxsize=4096)
+def _spatial_guesses(length: int, turns: int) -> float:
+    guesses = 0.0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += math.comb(i - 1, j - 1) * _KEYBOARD_STARTS * _KEYBOARD_AVG_DEGREE ** j
+    return guesses
+
+
+def _uppercase_variations(token: str) -> int:
+    if token.islower() or not any(c.isalpha() for c in token):
+        return 1
+    if token.isupper():
+        return 2
+    if token[0].isupper() and token[1:].islower():
+        return 2
+    if token[-1].isupper() and token[:-1].islower():
+        return 2
+    uppers = sum(1 for c in token if c.isupper())
+    lowers = sum(1 for c in token if c.islower())
+    return _mixed_variations(uppers, uppers + lowers)
+
+
+def _same_class(a: str, b: str) -> bool:
+    return (a.isdigit() and b.isdigit()) or (a.islower() and b.islower()) or (a.isupper() and b.isupper())
+
+
+def _year_guesses(year: int) -> int:
+    return max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE)
+
+
+def _two_digit_year(y: int) -> int:
+    return 1900 + y if y > 50 else 2000 + y
+
+
+def _valid_dmy(a: int, b: int, year: int) -> bool:
+    if not DATE_MIN_YEAR <= year <= DATE_MAX_YEAR:
+        return False
+    # Either day/month or month/day order
+    return (1 <= a <= 31 and 1 <= b <= 12) or (1 <= a <= 12 and 1 <= b <= 31)
+
+
+def _date_from_parts(parts) -> int:
+    # parts: digit strings in written order; returns the year or 0 if invalid
+    first, mid, last = parts
+    for y, a, b in ((last, first, mid), (first, mid, last)):
+        if len(y) not in (2, 4) or len(a) > 2 or len(b) > 2:
+            continue
+        year = int(y) if len(y) == 4 else _two_digit_year(int(y))
+        if _valid_dmy(int(a), int(b), year):
+            return year
+    return 0
+
+
+# Ways to split an unseparated digit run into day/month/year pieces
+_DATE_SPLITS = {
+    4: [(1, 2), (2, 3)],
+    5: [(1, 3), (2, 3)],
+    6: [(1, 2), (2, 4), (4, 5)],
+    7: [(1, 3), (2, 3), (4, 5), (4, 6)],
+    8: [(2, 4), (4, 6)],
+}
+
+
+@lru_cache(maxsize=65536)
+def _digit_date_guesses(token: str):
+    # log10 guesses for an unseparated digit date (or bare recent year)
+    if len(token) == 4 and 1900 <= int(token) <= DATE_MAX_YEAR:
+        return math.log10(_year_guesses(int(token)))
+    for a, b in _DATE_SPLITS[len(token)]:
+        year = _date_from_parts((token[:a], token[a:b], token[b:]))
+        if year:
+            return math.log10(_year_guesses(year) * 365)
+    return None
+
+
+class GuessEstimator:
+    def __init__(self, dictionaries) -> None:
+        # dictionaries: iterables of lowercase words; a word's rank is the size
+        # of the smallest dictionary containing it (uniform-rank assumption).
+        ranks = {}
+        for words in dictionaries:
+            words = {w for w in words if len(w) >= MIN_DICT_WORD_LEN}
+            size = max(1, len(words))
+            for w in words:
+                if w not in ranks or size < ranks[w]:
+                    ranks[w] = size
+        self._matcher = AhoCorasick(sorted(ranks))
+        self._ranks = [ranks[w] for w in self._matcher.words]
+
+    @classmethod
+    def from_parts(cls, matcher, ranks) -> "GuessEstimator":
+        # Reuses an existing matcher and per-word-id ranks (e.g. flat views
+        # over shared memory, see shareddict.py)
+        est = cls.__new__(cls)
+        est._matcher = matcher
+        est._ranks = ranks
+        return est
+
+    # Matchers yield (start, end, pattern, log10 guesses)
+
+    def _dictionary_matches(self, password: str, lower_p: str, leet_p: str):
+        matcher, ranks = self._matcher, self._ranks
+        words = matcher.words
+        seen = set()
+        for view, leet in ((lower_p, False), (leet_p, True)):
+            for end, ids in matcher.iter_matches(view):
+                for idx in ids:
+                    word = words[idx]
+                    start = end - len(word)
+                    if (start, end, idx) in seen:
+                        continue
+                    seen.add((start, end, idx))
+                    token = password[start:end]
+                    guesses = ranks[idx] * _uppercase_variations(token)
+                    pattern = "dictionary"
+                    if leet:
+                        subs = sum(1 for x, y in zip(lower_p[start:end], word) if x != y)
+                        if not subs:
+                            continue
+                        guesses *= _mixed_variations(subs, len(word))
+                        pattern = "l33t"
+                    yield start, end, pattern, math.log10(guesses)
+
+    @staticmethod
+    def _sequence_matches(password: str):
+        n = len(password)
+        i = 0
+        while i < n - 2:
+            delta = ord(password[i + 1]) - ord(password[i])
+            if delta not in (1, -1) or not _same_class(password[i], password[i + 1]):
+                i += 1
+                continue
+            j = i + 1
+            while j + 1 < n and ord(password[j + 1]) - ord(password[j]) == delta \
+                    and _same_class(password[j], password[j + 1]):
+                j += 1
+            if j - i >= 2:
+                first = password[i]
+                if first in "aAzZ019":
+                    base = 4
+                elif first.isdigit():
+                    base = 10
+                else:
+                    base = 26
+                if delta < 0:
+                    base *= 2
+                yield i, j + 1, "sequence", math.log10(base * (j + 1 - i))
+            i = j
+
+    def _repeat_matches(self, password: str):
+        for m in _REPEAT_RE.finditer(password):
+            base = m.group(1)
+            count = (m.end() - m.start()) // len(base)
+            base_log = self.estimate(base)[0] if len(base) > 1 else _LOG10_BRUTEFORCE
+            yield m.start(), m.end(), "repeat", base_log + math.log10(count)
+
+    @staticmethod
+    def _date_matches(password: str):
+        for m in _DATE_SEP_RE.finditer(password):
+            year = _date_from_parts((m.group(1), m.group(3), m.group(4)))
+            if year:
+                yield m.start(), m.end(), "date", math.log10(_year_guesses(year) * 365 * 4)
+        for run in _DIGITS_RE.finditer(password):
+            digits, offset = run.group(), run.start()
+            for length in range(4, 9):
+                for i in range(0, len(digits) - length + 1):
+                    log_g = _digit_date_guesses(digits[i:i + length])
+                    if log_g is not None:
+                        yield offset + i, offset + i + length, "date", log_g
+
+    @staticmethod
+    def _keyboard_matches(password: str):
+        n = len(password)
+        i = 0
+        while i < n - 2:
+            j = i
+            turns = 0
+            last_dir = None
+            shifted = 1 if password[i] in QWERTY_SHIFTED else 0
+            while j + 1 < n:
+                direction = QWERTY_GRAPH.get(password[j], {}).get(password[j + 1])
+                if direction is None:
+                    break
+                if direction != last_dir:
+                    turns += 1
+                    last_dir = direction
+                j += 1
+                shifted += password[j] in QWERTY_SHIFTED
+            length = j + 1 - i
+            if length >= 3:
+                guesses = _spatial_guesses(length, turns)
+                if shifted:
+                    guesses *= _mixed_variations(shifted, length)
+                yield i, j + 1, "keyboard", math.log10(guesses)
+                i = j
+            else:
+                i += 1
+
+    def estimate(self, password: str) -> tuple:
+        # Returns (log10 guesses, [(start, end, pattern, token)]) for the
+        # minimum-guess decomposition of the password.
+        n = len(password)
+        if not n:
+            return 0.0, []
+        lower_p = password.lower()
+        if len(lower_p) != n:
+            # Length-changing case folds would misalign positions
+            lower_p = "".join(c if len(c.lower()) != 1 else c.lower() for c in password)
+        leet_p = lower_p.translate(LEET_MAP)
+
+        by_end = [[] for _ in range(n + 1)]
+        for matches in (
+            self._dictionary_matches(password, lower_p, leet_p),
+            self._sequence_matches(password),
+            self._repeat_matches(password),
+            self._date_matches(password),
+            self._keyboard_matches(password),
+        ):
+            for start, end, pattern, log_g in matches:
+                if end - start < n:
+                    floor = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if end - start == 1 \
+                        else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+                    log_g = max(log_g, math.log10(floor))
+                by_end[end].append((start, pattern, log_g))
+
+        best = [0.0] * (n + 1)
+        back = [None] * (n + 1)
+        for j in range(1, n + 1):
+            best[j] = best[j - 1] + _LOG10_BRUTEFORCE
+            back[j] = (j - 1, "bruteforce")
+            for start, pattern, log_g in by_end[j]:
+                cand = best[start] + log_g
+                if cand < best[j]:
+                    best[j] = cand
+                    back[j] = (start, pattern)
+
+        sequence = []
+        j = n
+        while j > 0:
+            start, pattern = back[j]
+            if pattern == "bruteforce" and sequence and sequence[-1][2] == "bruteforce" \
+                    and sequence[-1][0] == j:
+                prev = sequence.pop()
+                sequence.append((start, prev[1], pattern, password[start:prev[1]]))
+            else:
+                sequence.append((start, j, pattern, password[start:j]))
+            j = start
+        sequence.reverse()
+        return best[n], sequence
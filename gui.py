@@ -0,0 +1,554 @@
+import queue
+import sys
+import threading
+from collections import deque
+import tkinter as tk
+from tkinter import ttk
+
+import app
+from app import EMPTY_RESULT, IncrementalEvaluator, evaluate_password, generate_passphrase, generate_password
+
+
+# ---------------------------
+# Color helpers
+# ---------------------------
+
+def _hex_to_rgb(hex_color: str) -> tuple:
+    h = hex_color.lstrip('#')
+    return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
+
+def _rgb_to_hex(rgb: tuple) -> str:
+    r, g, b = rgb
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+def _brightness(rgb: tuple) -> float:
+    r, g, b = rgb
+    return (r * 299 + g * 587 + b * 114) / 1000.0
+
+def _best_text_color(bg_hex: str) -> str:
+    br = _brightness(_hex_to_rgb(bg_hex))
+    return "#000000" if br >= 128 else "#ffffff"
+
+def _shade(hex_color: str, amount: float) -> str:
+    # amount: -1.0..1.0 negative=darken, positive=lighten
+    r, g, b = _hex_to_rgb(hex_color)
+    if amount >= 0:
+        r = int(r + (255 - r) * amount)
+        g = int(g + (255 - g) * amount)
+        b = int(b + (255 - b) * amount)
+    else:
+        amt = 1 + amount
+        r = int(r * amt)
+        g = int(g * amt)
+        b = int(b * amt)
+    r = max(0, min(255, r))
+    g = max(0, min(255, g))
+    b = max(0, min(255, b))
+    return _rgb_to_hex((r, g, b))
+
+
+# ---------------------------
+# Pre-generated candidates
+# ---------------------------
+
+class _GeneratorPool:
+    # Keeps a few candidates ready for the generator settings last used, so
+    # the Generate buttons never wait on the strength check. A spec is
+    # ("password", length, min_score) or
+    # ("passphrase", words, caps, numbers, min_score); one pool per kind.
+    SIZE = 4
+
+    def __init__(self) -> None:
+        self._pools = {}  # kind -> (spec, deque of candidates)
+        self._unreachable = set()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._fill, name="lasanga-gen", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+
+    def want(self, spec: tuple) -> None:
+        # Start filling for `spec` (replaces the pool of the same kind)
+        current = self._pools.get(spec[0])
+        if current is None or current[0] != spec:
+            self._pools[spec[0]] = (spec, deque())
+        self._wake.set()
+
+    def take(self, spec: tuple) -> str:
+        # A ready candidate, or one generated now (ValueError if unreachable)
+        self.want(spec)
+        try:
+            return self._pools[spec[0]][1].popleft()
+        except (KeyError, IndexError):
+            return _generate_spec(spec)
+        finally:
+            self._wake.set()
+
+    def _fill(self) -> None:
+        while not self._closed:
+            self._wake.wait()
+            self._wake.clear()
+            for spec, ready in list(self._pools.values()):
+                while len(ready) < self.SIZE and not self._closed and spec not in self._unreachable:
+                    if self._pools.get(spec[0], (None,))[0] != spec:
+                        break  # settings changed meanwhile
+                    try:
+                        ready.append(_generate_spec(spec))
+                    except ValueError:
+                        self._unreachable.add(spec)
+
+
+def _generate_spec(spec: tuple) -> str:
+    if spec[0] == "password":
+        _, length, min_score = spec
+        return generate_password(length, min_score=min_score)
+    _, words, caps, numbers, min_score = spec
+    return generate_passphrase(num_words=words, separator='-', capitalize=caps, add_number=numbers,
+                               min_score=min_score)
+
+
+# ---------------------------
+# Tkinter Desktop Application
+# ---------------------------
+
+class PasswordCheckerApp(tk.Tk):
+    # Keystrokes within this window are coalesced into one evaluation
+    DEBOUNCE_MS = 40
+    # Generator targets: minimum score per choice
+    TARGETS = {"Any": None, "Fair": 50, "Good": 70, "Very Strong": 85}
+    # How often the Tk loop checks for finished background evaluations
+    POLL_MS = 10
+
+    def __init__(self) -> None:
+        super().__init__()
+        # Set Windows AppUserModelID for taskbar grouping and identity
+        if sys.platform == "win32":
+            try:
+                import ctypes
+
+                ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID("lasanga")
+            except Exception:
+                pass
+        self.title("lasanga – Password Strength Checker")
+        self.geometry("720x520")
+        self.minsize(640, 480)
+
+        self.style = ttk.Style()
+        try:
+            self.style.theme_use('clam')
+        except Exception:
+            pass
+
+        # Determine default background and set current
+        default_bg = self.style.lookup('TFrame', 'background') or self.cget('background') or '#f0f0f0'
+        if default_bg in ("SystemButtonFace", "systemWindowBody"):
+            default_bg = '#f0f0f0'
+        self.default_bg = default_bg
+        self.current_bg = default_bg
+
+        # Scoring runs on a worker thread; each request carries a generation
+        # number so results for superseded input are dropped on arrival.
+        # The evaluator (and with it the dictionaries) is built on the worker
+        # thread once the window is up; see _start_worker.
+        self.evaluator = None
+        self._generation = 0
+        self._debounce_id = None
+        self._poll_id = None
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._worker = threading.Thread(target=self._evaluation_worker, name="lasanga-eval", daemon=True)
+        # Started by the evaluation worker once the dictionaries are loaded
+        self._generators = _GeneratorPool()
+        # (passphrase, exact bits, exact?) for the last generated passphrase
+        self._generated = None
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        self._build_ui()
+        self._apply_bg_color(self.current_bg)
+        self._prime_generators()
+        for var in (self.gen_len_var, self.pass_words_var, self.pass_caps_var, self.pass_nums_var, self.target_var):
+            var.trace_add("write", self._prime_generators)
+        # Runs after the first paint
+        self.after_idle(self._worker.start)
+
+    def _build_ui(self) -> None:
+        root = ttk.Frame(self, padding=16)
+        root.pack(fill=tk.BOTH, expand=True)
+
+        # Password input row
+        row1 = ttk.Frame(root)
+        row1.pack(fill=tk.X, pady=(0, 8))
+        ttk.Label(row1, text="Password:").pack(side=tk.LEFT)
+
+        self.password_var = tk.StringVar()
+        self.entry = ttk.Entry(row1, textvariable=self.password_var, show='•', width=50, style='App.TEntry')
+        self.entry.pack(side=tk.LEFT, padx=(8, 8), fill=tk.X, expand=True)
+        self.entry.bind('<KeyRelease>', self._on_password_change)
+
+        self.show_var = tk.BooleanVar(value=False)
+        show_cb = ttk.Checkbutton(row1, text="Show", variable=self.show_var, command=self._toggle_show)
+        show_cb.pack(side=tk.LEFT, padx=(0, 8))
+
+        copy_btn = ttk.Button(row1, text="Copy", command=self._copy_password)
+        copy_btn.pack(side=tk.LEFT)
+        clear_btn = ttk.Button(row1, text="Clear", command=self._clear_password)
+        clear_btn.pack(side=tk.LEFT, padx=(8, 0))
+
+        # Generator row
+        row2 = ttk.Frame(root)
+        row2.pack(fill=tk.X, pady=(0, 12))
+        ttk.Label(row2, text="Generator:").pack(side=tk.LEFT)
+
+        self.gen_len_var = tk.IntVar(value=16)
+        ttk.Label(row2, text="Length").pack(side=tk.LEFT, padx=(8, 4))
+        gen_len = ttk.Spinbox(row2, from_=8, to=64, textvariable=self.gen_len_var, width=5, style='App.TSpinbox')
+        gen_len.pack(side=tk.LEFT)
+
+        ttk.Button(row2, text="Generate Strong", command=self._gen_password).pack(side=tk.LEFT, padx=(12, 8))
+        self.pass_words_var = tk.IntVar(value=4)
+        ttk.Label(row2, text="Words").pack(side=tk.LEFT, padx=(8, 4))
+        pass_words = ttk.Spinbox(row2, from_=3, to=10, textvariable=self.pass_words_var, width=4, style='App.TSpinbox')
+        pass_words.pack(side=tk.LEFT)
+        self.pass_caps_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(row2, text="Caps", variable=self.pass_caps_var).pack(side=tk.LEFT, padx=(8, 4))
+        self.pass_nums_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(row2, text="Add Numbers", variable=self.pass_nums_var).pack(side=tk.LEFT)
+        ttk.Button(row2, text="Generate Passphrase", command=self._gen_passphrase).pack(side=tk.LEFT, padx=(12, 0))
+
+        # Background color row
+        row3 = ttk.Frame(root)
+        row3.pack(fill=tk.X, pady=(0, 12))
+        ttk.Label(row3, text="Background:").pack(side=tk.LEFT)
+        ttk.Button(row3, text="Pick...", command=self._pick_bg_color).pack(side=tk.LEFT, padx=(8, 4))
+        ttk.Button(row3, text="Reset", command=self._reset_bg_color).pack(side=tk.LEFT)
+        ttk.Label(row3, text="Generate at least:").pack(side=tk.LEFT, padx=(16, 4))
+        self.target_var = tk.StringVar(value="Any")
+        ttk.Combobox(row3, textvariable=self.target_var, values=list(self.TARGETS), state="readonly",
+                     width=11).pack(side=tk.LEFT)
+        self.profile_var = tk.BooleanVar(value=app._PROFILER is not None)
+        ttk.Checkbutton(row3, text="Profiling", variable=self.profile_var,
+                        command=self._toggle_profiling).pack(side=tk.RIGHT)
+
+        # Meter section
+        meter = ttk.LabelFrame(root, text="Strength")
+        meter.pack(fill=tk.X, pady=(0, 12))
+
+        self.style.configure("meter.Horizontal.TProgressbar", troughcolor="#e6e6e6", background="#27ae60")
+        # Last rendered values (see _update_ui) and per-color meter styles
+        self._rendered = {}
+        self._meter_styles = {}
+        for color in ("#666666", "#e74c3c", "#e67e22", "#f1c40f", "#2ecc71", "#27ae60"):
+            self._meter_style(color)
+        self.pb = ttk.Progressbar(meter, style="meter.Horizontal.TProgressbar", maximum=100)
+        self.pb.pack(fill=tk.X, padx=12, pady=8)
+
+        stats_row = ttk.Frame(meter)
+        stats_row.pack(fill=tk.X, padx=12, pady=(0, 8))
+        self.strength_label = ttk.Label(stats_row, text="", width=16)
+        self.strength_label.pack(side=tk.LEFT)
+        self.entropy_label = ttk.Label(stats_row, text="")
+        self.entropy_label.pack(side=tk.LEFT, padx=(16, 0))
+        self.time_label = ttk.Label(stats_row, text="")
+        self.time_label.pack(side=tk.RIGHT)
+
+        # Suggestions
+        sug = ttk.LabelFrame(root, text="Suggestions")
+        sug.pack(fill=tk.BOTH, expand=True)
+        self.sug_text = tk.Text(sug, height=10, wrap=tk.WORD)
+        self.sug_text.configure(state=tk.DISABLED)
+        self.sug_text.pack(fill=tk.BOTH, expand=True, padx=12, pady=8)
+
+        # Optional debug panel: per-stage scoring times (see profiling.py)
+        self.profile_frame = ttk.LabelFrame(root, text="Profiling")
+        self.profile_text = tk.Text(self.profile_frame, height=10, font=("TkFixedFont",))
+        self.profile_text.configure(state=tk.DISABLED)
+        self.profile_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(12, 8), pady=8)
+        ttk.Button(self.profile_frame, text="Reset", command=self._reset_profiling).pack(side=tk.TOP, padx=(0, 12), pady=8)
+        ttk.Button(self.profile_frame, text="Copy JSON", command=self._copy_profiling).pack(side=tk.TOP, padx=(0, 12))
+        if app._PROFILER is not None:
+            self.profile_frame.pack(fill=tk.X, pady=(12, 0))
+
+        # Initial state
+        self._update_ui(evaluate_password(""))
+
+    def _toggle_show(self) -> None:
+        self.entry.configure(show='' if self.show_var.get() else '•')
+
+    def _copy_password(self) -> None:
+        text = self.password_var.get()
+        from tkinter import messagebox
+
+        if not text:
+            messagebox.showinfo("Copy", "Nothing to copy.")
+            return
+        self.clipboard_clear()
+        self.clipboard_append(text)
+        messagebox.showinfo("Copy", "Password copied to clipboard.")
+
+    def _clear_password(self) -> None:
+        self.password_var.set("")
+        self.entry.focus_set()
+
+    def _password_spec(self) -> tuple:
+        try:
+            n = int(self.gen_len_var.get())
+        except Exception:
+            n = 16
+        return ("password", max(8, min(64, n)), self.TARGETS.get(self.target_var.get()))
+
+    def _passphrase_spec(self) -> tuple:
+        try:
+            n = int(self.pass_words_var.get())
+        except Exception:
+            n = 4
+        return ("passphrase", max(3, min(10, n)), bool(self.pass_caps_var.get()),
+                bool(self.pass_nums_var.get()), self.TARGETS.get(self.target_var.get()))
+
+    def _prime_generators(self, *_args) -> None:
+        # Refill for the current settings before the next click
+        self._generators.want(self._password_spec())
+        self._generators.want(self._passphrase_spec())
+
+    def _gen_password(self) -> None:
+        self._use_generated(self._password_spec())
+
+    def _gen_passphrase(self) -> None:
+        self._use_generated(self._passphrase_spec())
+
+    def _use_generated(self, spec: tuple) -> None:
+        try:
+            pwd = self._generators.take(spec)
+        except ValueError:
+            from tkinter import messagebox
+
+            messagebox.showinfo("Generate", f"These settings cannot reach \"{self.target_var.get()}\". "
+                                            "Use more characters or words, or a lower target.")
+            return
+        self._generated = None
+        if spec[0] == "passphrase":
+            # Known construction: report its real entropy, not the charset estimate
+            _, words, _, numbers, min_score = spec
+            self._generated = (pwd, app.passphrase_entropy(words, add_number=numbers), min_score is None)
+        self.password_var.set(pwd)
+        self._on_password_change()
+
+    def _on_password_change(self, _event=None) -> None:
+        # Keep the Tk thread cheap: bump the generation and (re)arm the debounce
+        # timer. Programmatic changes (generators) skip the debounce.
+        self._generation += 1
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+        delay = self.DEBOUNCE_MS if _event is not None else 0
+        self._debounce_id = self.after(delay, self._submit_evaluation)
+
+    def _submit_evaluation(self) -> None:
+        self._debounce_id = None
+        self._requests.put((self._generation, self.password_var.get()))
+        if self._poll_id is None:
+            self._poll_id = self.after(self.POLL_MS, self._poll_results)
+
+    def _evaluation_worker(self) -> None:
+        self.evaluator = IncrementalEvaluator()
+        app.passphrase_words()  # opens $LASAGNA_WORDLIST before the generator thread uses it
+        self._generators.start()
+        while True:
+            item = self._requests.get()
+            # Only the newest queued request matters
+            try:
+                while True:
+                    item = self._requests.get_nowait()
+            except queue.Empty:
+                pass
+            if item is None:
+                return
+            generation, text = item
+            if generation != self._generation:
+                continue
+            # The meter first (incremental, O(1) per keystroke); the guess
+            # estimate behind the crack time scans the whole password, so it
+            # only runs once no newer input is waiting
+            try:
+                result = self.evaluator.update(text, guesses=False)
+            except Exception:
+                self.evaluator.reset()
+                result = dict(EMPTY_RESULT, suggestions=["Could not evaluate this password."])
+            self._results.put((generation, result))
+            if "crack_time" in result or not self._requests.empty() or generation != self._generation:
+                continue
+            try:
+                result = self.evaluator.result()
+            except Exception:
+                result = dict(result, crack_time="")
+            self._results.put((generation, result))
+
+    def _poll_results(self) -> None:
+        self._poll_id = None
+        latest = None
+        try:
+            while True:
+                generation, result = self._results.get_nowait()
+                if generation == self._generation:
+                    latest = result
+        except queue.Empty:
+            pass
+        if latest is not None:
+            generated = self._generated
+            if generated is not None and generated[0] == self.password_var.get():
+                latest = dict(latest, entropy_bits=generated[1], entropy_note="exact" if generated[2] else "at most")
+            self._update_ui(latest)
+            if self.profile_var.get():
+                self._refresh_profiling()
+            if "crack_time" in latest:
+                return
+            # Keep polling for the crack time of the same input
+        self._poll_id = self.after(self.POLL_MS, self._poll_results)
+
+    def _toggle_profiling(self) -> None:
+        if self.profile_var.get():
+            from profiling import StageProfiler
+
+            app.set_profiler(StageProfiler())
+            self.profile_frame.pack(fill=tk.X, pady=(12, 0))
+            self._refresh_profiling()
+        else:
+            app.set_profiler(None)
+            self.profile_frame.pack_forget()
+
+    def _reset_profiling(self) -> None:
+        if app._PROFILER is not None:
+            app._PROFILER.reset()
+        self._refresh_profiling()
+
+    def _copy_profiling(self) -> None:
+        if app._PROFILER is not None:
+            self.clipboard_clear()
+            self.clipboard_append(app._PROFILER.to_json(indent=2))
+
+    def _refresh_profiling(self) -> None:
+        text = app._PROFILER.format_table() if app._PROFILER is not None else ""
+        self.profile_text.configure(state=tk.NORMAL)
+        self.profile_text.delete("1.0", tk.END)
+        self.profile_text.insert(tk.END, text)
+        self.profile_text.configure(state=tk.DISABLED)
+
+    def _on_close(self) -> None:
+        self._requests.put(None)
+        self._generators.close()
+        self.destroy()
+
+    def _meter_style(self, color: str) -> str:
+        # One progressbar style per meter color, configured once. Switching
+        # the widget's style is cheap; reconfiguring a shared style redraws
+        # every widget of the theme. Children inherit the trough color from
+        # meter.Horizontal.TProgressbar.
+        name = self._meter_styles.get(color)
+        if name is None:
+            name = f"{color.lstrip('#')}.meter.Horizontal.TProgressbar"
+            self.style.configure(name, background=color)
+            self._meter_styles[color] = name
+        return name
+
+    def _update_ui(self, result: dict) -> None:
+        # Only widgets whose value differs from the last render are touched
+        score = result.get("score", 0)
+        label = result.get("label", "")
+        color = result.get("color", "#666666")
+        ent = result.get("entropy_bits", 0.0)
+        suggestions = [f"• {s}" for s in result.get("suggestions", [])]
+        rendered = self._rendered
+
+        if rendered.get("score") != score:
+            self.pb['value'] = score
+            rendered["score"] = score
+        if rendered.get("color") != color:
+            self.pb.configure(style=self._meter_style(color))
+            rendered["color"] = color
+        self._set_label(self.strength_label, "strength", f"{label} ({score}/100)" if label else "")
+        note = f" ({result['entropy_note']})" if result.get("entropy_note") else ""
+        self._set_label(self.entropy_label, "entropy", f"Entropy: {ent:.1f} bits{note}" if ent else "")
+        if "crack_time" in result:
+            # Absent until the worker's guess estimate arrives; keep the last one
+            crack = result["crack_time"]
+            self._set_label(self.time_label, "time", f"Est. crack time: {crack}" if crack else "")
+
+        old = rendered.get("suggestions", [])
+        if old != suggestions:
+            self._render_lines(self.sug_text, old, suggestions)
+            rendered["suggestions"] = suggestions
+
+    def _set_label(self, widget, key: str, text: str) -> None:
+        if self._rendered.get(key) != text:
+            widget.configure(text=text)
+            self._rendered[key] = text
+
+    @staticmethod
+    def _render_lines(widget: tk.Text, old: list, new: list) -> None:
+        # Rewrites changed lines in place; appends or trims the tail
+        widget.configure(state=tk.NORMAL)
+        for i, line in enumerate(new[:len(old)], start=1):
+            if old[i - 1] != line:
+                widget.delete(f"{i}.0", f"{i}.end")
+                widget.insert(f"{i}.0", line)
+        if len(new) > len(old):
+            widget.insert(tk.END, "".join(f"{line}\n" for line in new[len(old):]))
+        elif len(new) < len(old):
+            widget.delete(f"{len(new) + 1}.0", tk.END)
+        widget.configure(state=tk.DISABLED)
+
+    def _apply_bg_color(self, bg_hex: str) -> None:
+        try:
+            fg_hex = _best_text_color(bg_hex)
+            bright = _brightness(_hex_to_rgb(bg_hex))
+            field_bg = _shade(bg_hex, 0.09 if bright < 128 else -0.06)
+            trough = _shade(bg_hex, 0.12 if bright < 128 else -0.10)
+
+            # Window background
+            self.configure(background=bg_hex)
+
+            # ttk styles
+            self.style.configure('TFrame', background=bg_hex)
+            self.style.configure('TLabel', background=bg_hex, foreground=fg_hex)
+            self.style.configure('TCheckbutton', background=bg_hex, foreground=fg_hex)
+            self.style.configure('TButton', background=bg_hex, foreground=fg_hex)
+            self.style.configure('TLabelframe', background=bg_hex, foreground=fg_hex)
+            self.style.configure('TLabelframe.Label', background=bg_hex, foreground=fg_hex)
+            self.style.configure('App.TEntry', fieldbackground=field_bg, foreground=fg_hex)
+            self.style.configure('App.TSpinbox', fieldbackground=field_bg, foreground=fg_hex, background=bg_hex)
+            self.style.configure('meter.Horizontal.TProgressbar', troughcolor=trough)
+
+            # Text widget
+            if hasattr(self, 'sug_text'):
+                self.sug_text.configure(bg=bg_hex, fg=fg_hex, insertbackground=fg_hex)
+            if hasattr(self, 'profile_text'):
+                self.profile_text.configure(bg=bg_hex, fg=fg_hex, insertbackground=fg_hex)
+        except Exception:
+            pass
+
+    def _pick_bg_color(self) -> None:
+        from tkinter import colorchooser
+
+        try:
+            _, hexcolor = colorchooser.askcolor(title="Choose background color", initialcolor=self.current_bg)
+            if hexcolor:
+                self.current_bg = hexcolor
+                self._apply_bg_color(self.current_bg)
+        except Exception:
+            pass
+
+    def _reset_bg_color(self) -> None:
+        self.current_bg = self.default_bg
+        self._apply_bg_color(self.current_bg)
+
+
+def main() -> None:
+    gui = PasswordCheckerApp()
+    gui.mainloop()
+
+
+if __name__ == "__main__":
+    main()
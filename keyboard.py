@@ -0,0 +1,82 @@
+# ---------------------------
+# Keyboard layouts
+# ---------------------------
+#
+# Layouts are rows of (unshifted, shifted) keys; a space marks a gap. On
+# staggered layouts each row is offset half a key from the one above, so a
+# key has up to 6 neighbours; the keypad is a plain grid with 8. The
+# letter rows start with a gap where Tab/Caps/Shift sit, which puts the
+# first letter under the 1 and 2 keys rather than under ` and 1.
+#
+# ADJACENT folds every layout into one 128 x 128 table of layout bits for
+# the scorers: ADJACENT[a << 7 | b] is non-zero when the keys typing ASCII
+# characters a and b touch, and its bits say on which layouts. Row and
+# column 0 (NUL) are empty, so callers can map any other character to 0.
+
+QWERTY_ROWS = [
+    ("`1234567890-=", "~!@#$%^&*()_+"),
+    (" qwertyuiop[]\\", " QWERTYUIOP{}|"),
+    (" asdfghjkl;'", " ASDFGHJKL:\""),
+    (" zxcvbnm,./", " ZXCVBNM<>?"),
+]
+AZERTY_ROWS = [
+    ("²&é\"'(-è_çà)=", "²1234567890°+"),
+    (" azertyuiop^$", " AZERTYUIOP¨£"),
+    (" qsdfghjklmù*", " QSDFGHJKLM%µ"),
+    (" wxcvbn,;:!", " WXCVBN?./§"),
+]
+KEYPAD_ROWS = [
+    (" /*-", " /*-"),
+    ("789+", "789+"),
+    ("456", "456"),
+    ("123", "123"),
+    (" 0.", " 0."),
+]
+# Neighbour offsets (row, col)
+STAGGERED = [(0, -1), (0, 1), (-1, 0), (-1, 1), (1, -1), (1, 0)]
+GRID = [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+QWERTY = 1
+AZERTY = 2
+KEYPAD = 4
+
+
+def build_graph(rows, directions) -> dict:
+    # char -> {neighbour char: direction index}; shifted keys share positions
+    grid = {}
+    for r, (plain, shifted) in enumerate(rows):
+        for c, (p, s) in enumerate(zip(plain, shifted)):
+            if p != " ":
+                grid[(r, c)] = (p, s)
+    graph = {}
+    for (r, c), keys in grid.items():
+        adj = {}
+        for d, (dr, dc) in enumerate(directions):
+            other = grid.get((r + dr, c + dc))
+            if other:
+                for ch in other:
+                    adj[ch] = d
+        for ch in keys:
+            graph[ch] = adj
+    return graph
+
+
+LAYOUTS = {
+    "qwerty": (QWERTY, build_graph(QWERTY_ROWS, STAGGERED)),
+    "azerty": (AZERTY, build_graph(AZERTY_ROWS, STAGGERED)),
+    "keypad": (KEYPAD, build_graph(KEYPAD_ROWS, GRID)),
+}
+
+
+def _adjacency_table() -> bytes:
+    table = bytearray(128 * 128)
+    for bit, graph in LAYOUTS.values():
+        for ch, adj in graph.items():
+            if ord(ch) < 128:
+                for other in adj:
+                    if ord(other) < 128:
+                        table[ord(ch) << 7 | ord(other)] |= bit
+    return bytes(table)
+
+
+ADJACENT = _adjacency_table()
@@ -0,0 +1,371 @@
+import struct
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+
+# ---------------------------
+# Multi-pattern substring matching
+# ---------------------------
+
+# Normalisation shared by every dictionary lookup (app and guesses):
+# leetspeak swaps undone before matching, and the shortest word matched as
+# a substring (shorter words are too noisy)
+LEET_MAP = str.maketrans({
+    '0': 'o', '1': 'l', '3': 'e', '4': 'a', '5': 's', '7': 't', '@': 'a', '$': 's', '!': 'i'
+})
+MIN_DICT_WORD_LEN = 4
+
+
+class AhoCorasick:
+    # Aho–Corasick automaton: finds every occurrence of every pattern in a
+    # single left-to-right pass, independent of the number of patterns.
+    # Each state keeps the pattern ids ending there (including those reached
+    # via failure links), so reporting a match needs no extra walking.
+
+    __slots__ = ("words", "_goto", "_fail", "_out")
+
+    def __init__(self, words) -> None:
+        self.words = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        seen = set()
+        for word in words:
+            if not word or word in seen:
+                continue
+            seen.add(word)
+            self._add(word)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def _add(self, word: str) -> None:
+        goto = self._goto
+        state = 0
+        for ch in word:
+            nxt = goto[state].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto[state][ch] = nxt
+                goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = (len(self.words),)
+        self.words.append(word)
+
+    def _link(self) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                f = goto[f].get(ch, 0)
+                fail[nxt] = f
+                if out[f]:
+                    out[nxt] = out[nxt] + out[f]
+
+    def step(self, state: int, ch: str) -> int:
+        goto, fail = self._goto, self._fail
+        while state and ch not in goto[state]:
+            state = fail[state]
+        return goto[state].get(ch, 0)
+
+    def matches_at(self, state: int) -> tuple:
+        # Pattern ids that end at the position that led to `state`
+        return self._out[state]
+
+    def iter_matches(self, text: str):
+        # (end, pattern ids) for every position where some pattern ends
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                yield i + 1, out[state]
+
+    def find_all(self, text: str) -> list:
+        # [(start, end, word)] for every occurrence, ordered by end position
+        goto, fail, out, words = self._goto, self._fail, self._out, self.words
+        found = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for idx in out[state]:
+                    word = words[idx]
+                    found.append((end - len(word), end, word))
+        return found
+
+    def search(self, text: str) -> bool:
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                return True
+        return False
+
+
+class PrefixTrie:
+    # Exact-match trie walked one character at a time; lets callers keep a
+    # node per prefix and test whole-string membership without rehashing.
+
+    __slots__ = ("_children", "_terminal")
+
+    root = 0
+    DEAD = -1
+
+    def __init__(self, words) -> None:
+        self._children = [{}]
+        self._terminal = set()
+        for word in words:
+            node = 0
+            for ch in word:
+                nxt = self._children[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._children)
+                    self._children[node][ch] = nxt
+                    self._children.append({})
+                node = nxt
+            self._terminal.add(node)
+
+    def walk(self, node: int, ch: str) -> int:
+        if node < 0:
+            return node
+        return self._children[node].get(ch, -1)
+
+    def is_word(self, node: int) -> bool:
+        return node in self._terminal
+
+
+# ---------------------------
+# Flat (pointer-free) layouts
+# ---------------------------
+#
+# The same automaton and an exact-match word set, stored as uint32 arrays
+# plus a UTF-8 blob in one contiguous buffer. They can be built once and
+# viewed in place from shared memory or an mmap by any number of processes;
+# nothing is unpacked into Python objects on attach.
+
+_FLAT_AC_MAGIC = b"LSGAHO01"
+_FLAT_SET_MAGIC = b"LSGSET01"
+_FLAT_AC_HEADER = struct.Struct("<8s5I")  # magic, states, edges, outputs, words, blob bytes
+_FLAT_SET_HEADER = struct.Struct("<8s2I")  # magic, words, blob bytes
+# Root transitions for code points below this are a direct table lookup
+_ROOT_TABLE = 128
+# States with at most this many edges are scanned instead of bisected
+_LINEAR_EDGES = 4
+
+
+def _u32(values) -> bytes:
+    return array("I", values).tobytes()
+
+
+def _words_blob(words) -> tuple:
+    encoded = [w.encode("utf-8", "surrogatepass") for w in words]
+    starts = [0]
+    for e in encoded:
+        starts.append(starts[-1] + len(e))
+    return _u32(starts), b"".join(encoded)
+
+
+def _take(view, offset: int, count: int) -> tuple:
+    # (uint32 view of `count` items at `offset`, offset after it)
+    end = offset + 4 * count
+    return view[offset:end].cast("I"), end
+
+
+class _FlatWords:
+    # Read-only sequence of words decoded on access
+    __slots__ = ("_starts", "_blob")
+
+    def __init__(self, starts, blob) -> None:
+        self._starts = starts
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._starts) - 1
+
+    def __getitem__(self, i: int) -> str:
+        starts = self._starts
+        return bytes(self._blob[starts[i]:starts[i + 1]]).decode("utf-8", "surrogatepass")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class FlatAhoCorasick:
+    # Same interface as AhoCorasick, over a buffer produced by build()
+
+    __slots__ = ("words", "_root", "_edge_start", "_edge_char", "_edge_to", "_fail", "_out_start", "_out_ids")
+
+    def __init__(self, buf) -> None:
+        view = memoryview(buf)
+        magic, states, edges, outputs, words, blob_len = _FLAT_AC_HEADER.unpack_from(view, 0)
+        if magic != _FLAT_AC_MAGIC:
+            raise ValueError("not a flat Aho-Corasick automaton")
+        offset = _FLAT_AC_HEADER.size
+        self._root, offset = _take(view, offset, _ROOT_TABLE)
+        self._edge_start, offset = _take(view, offset, states + 1)
+        self._edge_char, offset = _take(view, offset, edges)
+        self._edge_to, offset = _take(view, offset, edges)
+        self._fail, offset = _take(view, offset, states)
+        self._out_start, offset = _take(view, offset, states + 1)
+        self._out_ids, offset = _take(view, offset, outputs)
+        starts, offset = _take(view, offset, words + 1)
+        self.words = _FlatWords(starts, view[offset:offset + blob_len])
+
+    @staticmethod
+    def build(automaton) -> bytes:
+        # `automaton`: an AhoCorasick (word ids are kept) or an iterable of words
+        if not isinstance(automaton, AhoCorasick):
+            automaton = AhoCorasick(automaton)
+        goto, fail, out = automaton._goto, automaton._fail, automaton._out
+        edge_start, edge_char, edge_to = [0], [], []
+        out_start, out_ids = [0], []
+        for state, edges in enumerate(goto):
+            for ch, nxt in sorted(edges.items(), key=lambda kv: ord(kv[0])):
+                edge_char.append(ord(ch))
+                edge_to.append(nxt)
+            edge_start.append(len(edge_char))
+            out_ids.extend(out[state])
+            out_start.append(len(out_ids))
+        root = [goto[0].get(chr(c), 0) for c in range(_ROOT_TABLE)]
+        starts, blob = _words_blob(automaton.words)
+        header = _FLAT_AC_HEADER.pack(_FLAT_AC_MAGIC, len(goto), len(edge_char), len(out_ids),
+                                      len(automaton.words), len(blob))
+        return b"".join([
+            header, _u32(root), _u32(edge_start), _u32(edge_char), _u32(edge_to), _u32(fail),
+            _u32(out_start), _u32(out_ids), starts, blob,
+        ])
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def step(self, state: int, ch: str) -> int:
+        c = ord(ch)
+        starts, chars, targets, fail = self._edge_start, self._edge_char, self._edge_to, self._fail
+        while state:
+            lo, hi = starts[state], starts[state + 1]
+            if hi - lo > _LINEAR_EDGES:
+                i = bisect_left(chars, c, lo, hi)
+                if i < hi and chars[i] == c:
+                    return targets[i]
+            else:
+                # Most states have one or two edges; a scan beats bisect there
+                for i in range(lo, hi):
+                    if chars[i] == c:
+                        return targets[i]
+            state = fail[state]
+        if c < _ROOT_TABLE:
+            return self._root[c]
+        lo, hi = starts[0], starts[1]
+        i = bisect_left(chars, c, lo, hi)
+        return targets[i] if i < hi and chars[i] == c else 0
+
+    def matches_at(self, state: int) -> tuple:
+        lo, hi = self._out_start[state], self._out_start[state + 1]
+        return tuple(self._out_ids[lo:hi]) if lo != hi else ()
+
+    def iter_matches(self, text: str):
+        # step() inlined: one memoryview read per comparison adds up on long inputs
+        starts, chars, targets, fail = self._edge_start, self._edge_char, self._edge_to, self._fail
+        root, out_start, out_ids = self._root, self._out_start, self._out_ids
+        state = 0
+        for i, ch in enumerate(text):
+            c = ord(ch)
+            while state:
+                lo, hi = starts[state], starts[state + 1]
+                if hi - lo == 1:
+                    if chars[lo] == c:
+                        state = targets[lo]
+                        break
+                else:
+                    j = bisect_left(chars, c, lo, hi)
+                    if j < hi and chars[j] == c:
+                        state = targets[j]
+                        break
+                state = fail[state]
+            else:
+                state = root[c] if c < _ROOT_TABLE else self.step(0, ch)
+            lo, hi = out_start[state], out_start[state + 1]
+            if lo != hi:
+                yield i + 1, tuple(out_ids[lo:hi])
+
+    def find_all(self, text: str) -> list:
+        step, out_start, out_ids, words = self.step, self._out_start, self._out_ids, self.words
+        found = []
+        state = 0
+        for i, ch in enumerate(text):
+            state = step(state, ch)
+            lo, hi = out_start[state], out_start[state + 1]
+            if lo != hi:
+                end = i + 1
+                for idx in out_ids[lo:hi]:
+                    word = words[idx]
+                    found.append((end - len(word), end, word))
+        return found
+
+    def search(self, text: str) -> bool:
+        for _ in self.iter_matches(text):
+            return True
+        return False
+
+
+class FlatWordSet:
+    # Exact membership over sorted UTF-8 words (binary search in the blob)
+
+    __slots__ = ("_words", "_starts", "_blob")
+
+    def __init__(self, buf) -> None:
+        view = memoryview(buf)
+        magic, words, blob_len = _FLAT_SET_HEADER.unpack_from(view, 0)
+        if magic != _FLAT_SET_MAGIC:
+            raise ValueError("not a flat word set")
+        self._starts, offset = _take(view, _FLAT_SET_HEADER.size, words + 1)
+        self._blob = view[offset:offset + blob_len]
+        self._words = _FlatWords(self._starts, self._blob)
+
+    @staticmethod
+    def build(words) -> bytes:
+        ordered = sorted({w.encode("utf-8", "surrogatepass") for w in words})
+        starts, blob = _words_blob(w.decode("utf-8", "surrogatepass") for w in ordered)
+        return _FLAT_SET_HEADER.pack(_FLAT_SET_MAGIC, len(ordered), len(blob)) + starts + blob
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __iter__(self):
+        return iter(self._words)
+
+    def __contains__(self, word) -> bool:
+        if not isinstance(word, str):
+            return False
+        key = word.encode("utf-8", "surrogatepass")
+        starts, blob = self._starts, self._blob
+        lo, hi = 0, len(starts) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = bytes(blob[starts[mid]:starts[mid + 1]])
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return True
+        return False
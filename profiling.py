@@ -0,0 +1,84 @@
+import json
+import time
+from contextlib import contextmanager
+
+
+# ---------------------------
+# Per-stage timing counters for password scoring
+# ---------------------------
+#
+# Off by default: app.py checks one module global and takes the plain code
+# path while it is None. Turn it on with LASAGNA_PROFILE=1, the profile()
+# context manager below, or the desktop app's debug panel.
+#
+# Stages recorded by evaluate_password / IncrementalEvaluator:
+#   features     class counts, sequences, lower/de-leeted views (one pass)
+#   incremental  keystroke update of the incremental evaluator state
+#   common       common-password lookup
+#   dictionary   dictionary substring search
+#   breach       breach index lookup
+#   entropy      charset entropy
+#   guesses      pattern-based guess estimate
+#   score        score, label and suggestions
+#   total        whole call
+
+PROFILE_ENV = "LASAGNA_PROFILE"
+
+
+class StageProfiler:
+    __slots__ = ("calls", "ns")
+
+    def __init__(self) -> None:
+        self.calls = {}
+        self.ns = {}
+
+    @staticmethod
+    def start() -> int:
+        return time.perf_counter_ns()
+
+    def lap(self, stage: str, start: int) -> int:
+        # Charges the time since `start` to `stage`; returns now for chaining
+        now = time.perf_counter_ns()
+        self.calls[stage] = self.calls.get(stage, 0) + 1
+        self.ns[stage] = self.ns.get(stage, 0) + now - start
+        return now
+
+    def reset(self) -> None:
+        self.calls = {}
+        self.ns = {}
+
+    def as_dict(self) -> dict:
+        # Snapshot; safe to call while another thread is recording
+        calls = dict(self.calls)
+        ns = dict(self.ns)
+        out = {}
+        for stage, n in calls.items():
+            total = ns.get(stage, 0)
+            out[stage] = {"calls": n, "total_ns": total, "mean_ns": total // max(1, n)}
+        return out
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def format_table(self) -> str:
+        stats = self.as_dict()
+        total = stats.get("total", {}).get("total_ns", 0)
+        lines = [f"{'stage':<12}{'calls':>9}{'mean µs':>11}{'total ms':>11}{'share':>8}"]
+        for stage, s in sorted(stats.items(), key=lambda kv: -kv[1]["total_ns"]):
+            share = f"{100.0 * s['total_ns'] / total:.0f}%" if total and stage != "total" else ""
+            lines.append(f"{stage:<12}{s['calls']:>9}{s['mean_ns'] / 1e3:>11.1f}"
+                         f"{s['total_ns'] / 1e6:>11.2f}{share:>8}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile(profiler: StageProfiler = None):
+    # with profile() as prof: ...; prof.as_dict()
+    import app
+
+    profiler = profiler or StageProfiler()
+    previous = app.set_profiler(profiler)
+    try:
+        yield profiler
+    finally:
+        app.set_profiler(previous)
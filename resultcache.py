@@ -0,0 +1,197 @@
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+
+
+# ---------------------------
+# Persistent audit result cache
+# ---------------------------
+#
+# SQLite table of evaluate_password results keyed by HMAC-SHA256(password);
+# plaintext is never written. The HMAC key lives next to the database in
+# "<cache>.key" (mode 0600) unless LASAGNA_CACHE_KEY (hex) is set.
+#
+# Every entry belongs to one ruleset fingerprint: the scoring sources, the
+# reference year for dates, and the extra wordlist and breach index in use.
+# Opening the cache with a different fingerprint (or key) empties it, so a
+# rules change (or a new year) re-scores everything. Size is bounded by
+# evicting least recently used entries.
+
+CACHE_KEY_ENV = "LASAGNA_CACHE_KEY"
+DEFAULT_MAX_ENTRIES = 1_000_000
+# Host parameters per IN (...) query; stays below SQLite's lowest limit
+_QUERY_BATCH = 900
+# Eviction trims to this fraction of max_entries, so it runs rarely (there
+# is deliberately no index on `used`; it would slow down every lookup)
+_EVICT_TO = 0.9
+# Hit keys buffered before their recency is written in one transaction
+_TOUCH_BATCH = 50000
+# Modules whose code decides a result
+_SCORING_MODULES = ("app", "guesses", "keyboard", "matching")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS results (key BLOB PRIMARY KEY, result TEXT NOT NULL) WITHOUT ROWID;
+-- Recency lives in its own narrow table so touching a hit rewrites few pages
+CREATE TABLE IF NOT EXISTS recency (key BLOB PRIMARY KEY, used INTEGER NOT NULL) WITHOUT ROWID;
+"""
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def ruleset_fingerprint(words_path: str = None, breach_path: str = None) -> str:
+    # Changes whenever a result could: scoring code (built-in wordlists
+    # included), the year dates are priced against, the extra wordlist's
+    # contents, or the breach index file.
+    import importlib
+
+    import guesses
+
+    h = hashlib.sha256()
+    for name in _SCORING_MODULES:
+        h.update(name.encode("ascii"))
+        h.update(_file_digest(importlib.import_module(name).__file__).encode("ascii"))
+    # Date guesses count years from today's (guesses.REFERENCE_YEAR)
+    h.update(f"year{guesses.REFERENCE_YEAR}".encode("ascii"))
+    if words_path:
+        h.update(b"words" + _file_digest(words_path).encode("ascii"))
+    breach_path = breach_path or os.environ.get("LASAGNA_BREACH_INDEX")
+    if breach_path:
+        # Breach indexes can be gigabytes; identify by size and mtime
+        st = os.stat(breach_path)
+        h.update(f"breach{st.st_size}:{st.st_mtime_ns}".encode("ascii"))
+    return h.hexdigest()
+
+
+def _load_secret(path: str) -> bytes:
+    env = os.environ.get(CACHE_KEY_ENV)
+    if env:
+        return bytes.fromhex(env)
+    key_path = path + ".key"
+    try:
+        with open(key_path, "rb") as fh:
+            return bytes.fromhex(fh.read().decode("ascii").strip())
+    except FileNotFoundError:
+        pass
+    secret = os.urandom(32)
+    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as fh:
+        fh.write(secret.hex())
+    return secret
+
+
+class ResultCache:
+    def __init__(self, path: str, fingerprint: str, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 secret: bytes = None) -> None:
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self._secret = secret if secret is not None else _load_secret(path)
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+        meta = dict(self._db.execute("SELECT name, value FROM meta"))
+        # A different key can never match old entries, so treat it like a rules change
+        key_check = hmac.digest(self._secret, b"lasanga-cache", "sha256").hex()
+        if meta.get("fingerprint") != fingerprint or meta.get("key_check") != key_check:
+            with self._db:
+                self._db.execute("DELETE FROM results")
+                self._db.execute("DELETE FROM recency")
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                    [("fingerprint", fingerprint), ("key_check", key_check), ("clock", "0")],
+                )
+            meta["clock"] = "0"
+        # Logical clock for LRU: bumped once per batch of lookups/stores
+        self._clock = int(meta.get("clock", 0))
+        self._touched = []
+        self._size = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def keys(self, passwords: list) -> list:
+        secret = self._secret
+        return [hmac.digest(secret, p.encode("utf-8", "surrogatepass"), "sha256") for p in passwords]
+
+    def get_many(self, keys: list) -> dict:
+        # {key: result} for cached keys; marks them as recently used
+        found = {}
+        unique = list(set(keys))
+        self._clock += 1
+        for i in range(0, len(unique), _QUERY_BATCH):
+            batch = unique[i:i + _QUERY_BATCH]
+            marks = ",".join("?" * len(batch))
+            for key, result in self._db.execute(f"SELECT key, result FROM results WHERE key IN ({marks})", batch):
+                found[key] = json.loads(result)
+        if found:
+            self._touched.extend((self._clock, key) for key in found)
+            if len(self._touched) >= _TOUCH_BATCH:
+                self._flush_touched()
+        self.hits += sum(1 for key in keys if key in found)
+        self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, items: list) -> None:
+        # items: [(key, result)] for keys not currently cached
+        if not items:
+            return
+        rows = {key: json.dumps(result, ensure_ascii=False) for key, result in items}
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO results (key, result) VALUES (?, ?)", rows.items())
+            self._db.executemany("INSERT OR REPLACE INTO recency (key, used) VALUES (?, ?)",
+                                 [(key, self._clock) for key in rows])
+        self._size += len(rows)
+        if self._size > self.max_entries:
+            self.evict()
+
+    def _flush_touched(self) -> None:
+        with self._db:
+            self._db.executemany("UPDATE recency SET used = ? WHERE key = ?", self._touched)
+        self._touched = []
+
+    def evict(self) -> int:
+        # Drops least recently used entries once over max_entries
+        self._flush_touched()
+        with self._db:
+            self._size = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            if self._size <= self.max_entries:
+                return 0
+            excess = self._size - int(self.max_entries * _EVICT_TO)
+            self._db.execute(
+                "CREATE TEMP TABLE evicted AS SELECT key FROM recency ORDER BY used LIMIT ?", (excess,)
+            )
+            self._db.execute("DELETE FROM results WHERE key IN (SELECT key FROM evicted)")
+            self._db.execute("DELETE FROM recency WHERE key IN (SELECT key FROM evicted)")
+            self._db.execute("DROP TABLE evicted")
+        self._size -= excess
+        return excess
+
+    def close(self) -> None:
+        if self._db is None:
+            return
+        self._flush_touched()
+        if self._size > self.max_entries:
+            self.evict()
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('clock', ?)",
+                             (str(self._clock),))
+        self._db.close()
+        self._db = None
@@ -0,0 +1,319 @@
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from audit import _evaluate_chunk, _init_worker
+
+
+# ---------------------------
+# Local scoring service (HTTP/JSON over asyncio)
+# ---------------------------
+#
+#   POST /evaluate         {"password": "..."}        -> result
+#   POST /evaluate/batch   {"passwords": ["...", ...]} -> {"results": [...]}
+#   GET  /health                                       -> {"status": "ok"}
+#   GET  /stats                                        -> request counts, latency percentiles
+#
+# Scoring runs in a process pool whose workers load dictionaries and the
+# breach index once at startup (an extra wordlist is built once and shared,
+# see shareddict.py); the event loop only parses and routes.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_CONCURRENCY = 64
+MAX_BODY_BYTES = 4 * 1024 * 1024
+MAX_BATCH = 10000
+BATCH_CHUNK = 256
+KEEPALIVE_TIMEOUT = 15.0
+LATENCY_WINDOW = 100000
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    501: "Not Implemented",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+class ScoringService:
+    def __init__(self, workers: int = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 words_path: str = None, breach_path: str = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._words_path = words_path
+        self._breach_path = breach_path
+        self._shared = None
+        self._pool = None
+        self._semaphore = None
+        self._singles = deque()
+        self._flush_task = None
+        # The event loop only keeps weak references to tasks
+        self._tasks = set()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._requests = 0
+        self._passwords = 0
+        self._errors = 0
+        self._started = time.monotonic()
+
+    # Lifecycle
+
+    def start_pool(self) -> None:
+        shared_name = None
+        if self.workers > 1 and self._words_path:
+            from shareddict import SharedDictionaries
+
+            self._shared = SharedDictionaries(self._words_path)
+            shared_name = self._shared.name
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self._words_path, self._breach_path, shared_name),
+        )
+        # Spin every worker up (and load dictionaries) before taking traffic
+        list(self._pool.map(_evaluate_chunk, [[""]] * self.workers))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, ready=None) -> None:
+        if self._pool is None:
+            self.start_pool()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        server = await asyncio.start_server(self._handle_connection, host, port, backlog=1024)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+    # Scoring
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _score_one(self, password: str) -> dict:
+        # Single-password requests that arrive together share one executor
+        # round trip instead of paying the IPC cost each.
+        future = asyncio.get_running_loop().create_future()
+        self._singles.append((password, future))
+        if self._flush_task is None:
+            self._flush_task = self._spawn(self._flush_singles())
+        return await future
+
+    async def _flush_singles(self) -> None:
+        try:
+            while self._singles:
+                await asyncio.sleep(0)  # let concurrently arriving requests queue up
+                batch = [self._singles.popleft() for _ in range(min(BATCH_CHUNK, len(self._singles)))]
+                self._spawn(self._resolve(batch))
+        finally:
+            self._flush_task = None
+
+    async def _resolve(self, batch: list) -> None:
+        try:
+            results = await self._score([password for password, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _score(self, passwords: list) -> list:
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            chunks = [passwords[i:i + BATCH_CHUNK] for i in range(0, len(passwords), BATCH_CHUNK)]
+            parts = await asyncio.gather(
+                *(loop.run_in_executor(self._pool, _evaluate_chunk, chunk) for chunk in chunks)
+            )
+        self._passwords += len(passwords)
+        return [res for part in parts for res in part]
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+        uptime = time.monotonic() - self._started
+        return {
+            "requests": self._requests,
+            "passwords": self._passwords,
+            "errors": self._errors,
+            "uptime_s": round(uptime, 3),
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "latency_ms": {
+                "p50": round(_percentile(latencies, 50) * 1000, 3),
+                "p90": round(_percentile(latencies, 90) * 1000, 3),
+                "p99": round(_percentile(latencies, 99) * 1000, 3),
+                "max": round((latencies[-1] if latencies else 0.0) * 1000, 3),
+                "window": len(latencies),
+            },
+        }
+
+    # HTTP
+
+    async def _route(self, method: str, path: str, body: bytes):
+        path = path.split("?", 1)[0]
+        if path == "/health":
+            return {"status": "ok"}
+        if path == "/stats":
+            return self.stats()
+        if path not in ("/evaluate", "/evaluate/batch"):
+            raise HttpError(404, "Unknown endpoint.")
+        if method != "POST":
+            raise HttpError(405, "Use POST.")
+        try:
+            payload = json.loads(body or b"{}")
+        except (UnicodeDecodeError, ValueError):
+            raise HttpError(400, "Body must be JSON.")
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Body must be a JSON object.")
+
+        if path == "/evaluate":
+            password = payload.get("password")
+            if not isinstance(password, str):
+                raise HttpError(400, "'password' must be a string.")
+            return await self._score_one(password)
+
+        passwords = payload.get("passwords")
+        if not isinstance(passwords, list) or not all(isinstance(p, str) for p in passwords):
+            raise HttpError(400, "'passwords' must be a list of strings.")
+        if len(passwords) > MAX_BATCH:
+            raise HttpError(413, f"At most {MAX_BATCH} passwords per batch.")
+        return {"results": await self._score(passwords)}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                start = time.perf_counter()
+                keep_alive = await self._handle_request(request_line, reader, writer)
+                await writer.drain()
+                self._latencies.append(time.perf_counter() - start)
+                self._requests += 1
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _handle_request(self, request_line: bytes, reader, writer) -> bool:
+        keep_alive = True
+        try:
+            try:
+                method, path, version = request_line.decode("latin-1").split()
+            except ValueError:
+                keep_alive = False
+                raise HttpError(400, "Malformed request line.")
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+            if "transfer-encoding" in headers:
+                # Only Content-Length bodies are read; an unread chunked body
+                # would be parsed as the next request, so the connection ends
+                keep_alive = False
+                raise HttpError(501, "Transfer-Encoding is not supported.")
+            length = headers.get("content-length") or "0"
+            if not (length.isascii() and length.isdigit()):
+                keep_alive = False
+                raise HttpError(400, "Invalid Content-Length.")
+            length = int(length)
+            if length > MAX_BODY_BYTES:
+                keep_alive = False
+                raise HttpError(413, "Request body too large.")
+            body = await reader.readexactly(length) if length else b""
+            status, payload = 200, await self._route(method.upper(), path, body)
+        except HttpError as exc:
+            self._errors += 1
+            status, payload = exc.status, {"error": exc.message}
+        except Exception as exc:  # keep serving other requests
+            # Details go to the server log, never to the client
+            self._errors += 1
+            keep_alive = False
+            print(f"lasanga serve: request failed: {exc!r}", file=sys.stderr)
+            status, payload = 500, {"error": "Scoring failed."}
+
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        ).encode("latin-1")
+        writer.write(head + data)
+        return keep_alive
+
+
+def _raise_interrupt(*_args) -> None:
+    raise KeyboardInterrupt
+
+
+def run_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = None,
+               max_concurrency: int = DEFAULT_MAX_CONCURRENCY, words_path: str = None,
+               breach_path: str = None) -> None:
+    service = ScoringService(workers=workers, max_concurrency=max_concurrency,
+                             words_path=words_path, breach_path=breach_path)
+    service.start_pool()
+
+    # Stop cleanly (and print final stats) on SIGTERM as well as Ctrl+C
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+
+    def ready(server) -> None:
+        addr = server.sockets[0].getsockname()
+        print(f"Serving on http://{addr[0]}:{addr[1]} ({service.workers} workers)", file=sys.stderr)
+
+    try:
+        asyncio.run(service.serve(host, port, ready=ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+        print(json.dumps(service.stats()), file=sys.stderr)
@@ -0,0 +1,143 @@
+import atexit
+import gc
+import struct
+from array import array
+from multiprocessing import shared_memory
+
+import app
+from matching import FlatAhoCorasick, FlatWordSet
+
+
+# ---------------------------
+# Shared-memory dictionaries for worker pools
+# ---------------------------
+#
+# The parent builds the dictionary structures once (built-in lists plus any
+# --words file) and lays them out flat in one shared memory segment:
+#
+#   common     FlatWordSet of COMMON_PASSWORDS
+#   words      FlatWordSet of COMMON_WORDS
+#   matcher    FlatAhoCorasick behind the dictionary substring check
+#   guesses    FlatAhoCorasick behind the guess estimator's dictionary matcher
+#   ranks      uint32 rank per guesses word id
+#
+# Workers attach by name and score straight from the shared pages, so the
+# dictionaries cost their size once per machine instead of once per worker.
+#
+# Lookups in the flat layout run about 2x slower than in the dict-based
+# structures (every read goes through a memoryview), so pools only use it
+# when an extra wordlist makes per-worker copies expensive.
+
+SEGMENT_MAGIC = b"LSGSHM01"
+_SEGMENT_HEADER = struct.Struct("<8sI")  # magic, section count
+_SECTION = struct.Struct("<16sQQ")  # name, offset, length
+_ALIGN = 8
+
+# Segment this process attached to; the views handed to app point into it
+_ATTACHED = None
+
+
+def _pack(sections: dict) -> bytes:
+    table_size = _SEGMENT_HEADER.size + _SECTION.size * len(sections)
+    offset = -(-table_size // _ALIGN) * _ALIGN
+    table = [_SEGMENT_HEADER.pack(SEGMENT_MAGIC, len(sections))]
+    body = []
+    for name, data in sections.items():
+        table.append(_SECTION.pack(name.encode("ascii"), offset, len(data)))
+        pad = -len(data) % _ALIGN
+        body.append(data + b"\0" * pad)
+        offset += len(data) + pad
+    head = b"".join(table)
+    head += b"\0" * (-len(head) % _ALIGN)
+    return head + b"".join(body)
+
+
+def _unpack(buf) -> dict:
+    view = memoryview(buf)
+    magic, count = _SEGMENT_HEADER.unpack_from(view, 0)
+    if magic != SEGMENT_MAGIC:
+        raise ValueError("not a lasanga dictionary segment")
+    sections = {}
+    for i in range(count):
+        name, offset, length = _SECTION.unpack_from(view, _SEGMENT_HEADER.size + i * _SECTION.size)
+        sections[name.rstrip(b"\0").decode("ascii")] = view[offset:offset + length]
+    return sections
+
+
+def build_segment() -> bytes:
+    # Flat image of the dictionaries currently loaded in `app`
+    app.load_data()
+    estimator = app._GUESS_ESTIMATOR
+    return _pack({
+        "common": FlatWordSet.build(app.COMMON_PASSWORDS),
+        "words": FlatWordSet.build(app.COMMON_WORDS),
+        "matcher": FlatAhoCorasick.build(app._WORD_MATCHER),
+        "guesses": FlatAhoCorasick.build(estimator._matcher),
+        "ranks": array("I", estimator._ranks).tobytes(),
+    })
+
+
+class SharedDictionaries:
+    # Owner side: creates the segment; close() unlinks it
+    def __init__(self, words_path: str = None) -> None:
+        if words_path:
+            app.load_common_words(words_path)
+        data = build_segment()
+        self._shm = shared_memory.SharedMemory(create=True, size=len(data))
+        self._shm.buf[:len(data)] = data
+        self.name = self._shm.name
+        self.size = len(data)
+
+    def __enter__(self) -> "SharedDictionaries":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+def install(buf) -> None:
+    # Points app's dictionaries at the flat structures in `buf` (no copy)
+    from guesses import GuessEstimator
+
+    sections = _unpack(buf)
+    app.install_dictionaries(
+        common_passwords=FlatWordSet(sections["common"]),
+        common_words=FlatWordSet(sections["words"]),
+        word_matcher=FlatAhoCorasick(sections["matcher"]),
+        guess_estimator=GuessEstimator.from_parts(
+            FlatAhoCorasick(sections["guesses"]), sections["ranks"].cast("I")
+        ),
+    )
+
+
+def attach(name: str) -> None:
+    # Worker side; the segment stays mapped for the life of the process
+    global _ATTACHED
+    shm = shared_memory.SharedMemory(name=name)
+    previous = (app.COMMON_PASSWORDS, app.COMMON_WORDS)
+    install(shm.buf)
+    _ATTACHED = (shm, previous)
+    atexit.register(detach)
+
+
+def detach() -> None:
+    # Drops app's views into the segment, then unmaps it. Runs at exit:
+    # SharedMemory refuses to close (BufferError) while any view is alive,
+    # and under spawn its __del__ would otherwise report that per worker.
+    global _ATTACHED
+    if _ATTACHED is None:
+        return
+    (shm, (common_passwords, common_words)), _ATTACHED = _ATTACHED, None
+    app.COMMON_PASSWORDS = common_passwords
+    app.COMMON_WORDS = common_words
+    app._WORD_MATCHER = app._COMMON_TRIE = app._GUESS_ESTIMATOR = None
+    app._DATA_LOADED = False
+    app.DICT_GENERATION += 1
+    gc.collect()
+    shm.close()
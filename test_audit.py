@@ -0,0 +1,118 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+import audit
+import cli
+from resultcache import ResultCache, ruleset_fingerprint
+
+# "caf\xe9" in Latin-1: not valid UTF-8
+_RAW = b"correct horse\ncaf\xe9-Latin1-9!\nTr0ub4dor&3\n"
+
+
+class AuditOutputTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self._dir.name, "passwords.txt")
+        with open(self.src, "wb") as fh:
+            fh.write(_RAW)
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def _audit(self, fmt: str) -> bytes:
+        dst = os.path.join(self._dir.name, "report." + fmt)
+        self.assertEqual(cli.run(["audit", self.src, "-o", dst, "-f", fmt, "--include-password"]), 0)
+        with open(dst, "rb") as fh:
+            return fh.read()
+
+    def test_jsonl_keeps_non_utf8_password_bytes(self) -> None:
+        data = self._audit("jsonl")
+        lines = data.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn(b"caf\xe9-Latin1-9!", lines[1])
+        row = json.loads(lines[2].decode("utf-8"))
+        self.assertEqual(row["password"], "Tr0ub4dor&3")
+
+    def test_stdin_is_read_like_a_file(self) -> None:
+        dst = os.path.join(self._dir.name, "report.jsonl")
+        stdin = io.TextIOWrapper(io.BytesIO(_RAW), encoding="utf-8")
+        with mock.patch("sys.stdin", stdin):
+            self.assertEqual(cli.run(["audit", "-", "-o", dst, "--include-password"]), 0)
+        with open(dst, "rb") as fh:
+            lines = fh.read().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn(b"caf\xe9-Latin1-9!", lines[1])
+        self.assertFalse(stdin.closed)
+
+    def test_csv_keeps_non_utf8_password_bytes(self) -> None:
+        data = self._audit("csv")
+        lines = data.splitlines()
+        self.assertEqual(len(lines), 4)  # header + 3 rows
+        self.assertIn(b"caf\xe9-Latin1-9!", lines[2])
+        self.assertIn(b"Tr0ub4dor&3", lines[3])
+
+
+class AuditCacheTest(unittest.TestCase):
+    def test_last_chunk_is_cached(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "passwords.txt")
+            with open(src, "w") as fh:
+                fh.writelines(f"pw-{i}-X!\n" for i in range(25))
+            with ResultCache(os.path.join(tmp, "cache.db"), ruleset_fingerprint()) as cache:
+                with open(os.devnull, "w") as out:
+                    audit.run_audit(src, out, workers=1, chunk_size=10, cache=cache)
+                self.assertEqual(len(cache), 25)
+
+    def test_fingerprint_follows_reference_year(self) -> None:
+        import guesses
+
+        before = ruleset_fingerprint()
+        with mock.patch.object(guesses, "REFERENCE_YEAR", guesses.REFERENCE_YEAR + 1):
+            self.assertNotEqual(ruleset_fingerprint(), before)
+        self.assertEqual(ruleset_fingerprint(), before)
+
+
+# Workers attach to the shared dictionaries (see shareddict.py) and must
+# release them cleanly at exit
+_SPAWN_AUDIT = textwrap.dedent("""
+    import multiprocessing, os, sys
+    import audit
+
+    if __name__ == "__main__":
+        multiprocessing.set_start_method("spawn")
+        src, words = sys.argv[1:]
+        with open(os.devnull, "w") as out:
+            print(audit.run_audit(src, out, workers=2, chunk_size=10, words_path=words))
+""")
+
+
+class SharedDictionariesSpawnTest(unittest.TestCase):
+    def test_spawned_workers_exit_cleanly(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "passwords.txt")
+            words = os.path.join(tmp, "words.txt")
+            script = os.path.join(tmp, "spawn_audit.py")
+            with open(src, "w") as fh:
+                fh.writelines(f"zebrafish{i}\n" for i in range(50))
+            with open(words, "w") as fh:
+                fh.write("zebrafish\nkumquat\n")
+            with open(script, "w") as fh:
+                fh.write(_SPAWN_AUDIT)
+            env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(audit.__file__)))
+            proc = subprocess.run([sys.executable, script, src, words], capture_output=True,
+                                  text=True, env=env, timeout=120)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertEqual(proc.stdout.strip(), "50")
+        self.assertNotIn("BufferError", proc.stderr)
+        self.assertNotIn("Exception ignored", proc.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
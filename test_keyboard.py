@@ -0,0 +1,47 @@
+import unittest
+
+import app
+from guesses import GuessEstimator
+from keyboard import ADJACENT, AZERTY, LAYOUTS, QWERTY
+
+
+def _adjacent(a: str, b: str) -> int:
+    return ADJACENT[ord(a) << 7 | ord(b)]
+
+
+class NumberRowTest(unittest.TestCase):
+    def test_qwerty_letters_sit_under_the_right_digits(self) -> None:
+        graph = LAYOUTS["qwerty"][1]
+        self.assertEqual(set(graph["q"]) & set("`1234567890"), {"1", "2"})
+        self.assertEqual(set(graph["a"]) & set("qwertyuiop"), {"q", "w"})
+        self.assertEqual(set(graph["z"]) & set("asdfghjkl"), {"a", "s"})
+        self.assertTrue(_adjacent("q", "2") & QWERTY)
+        self.assertFalse(_adjacent("q", "`"))
+
+    def test_azerty_letters_sit_under_the_right_digits(self) -> None:
+        graph = LAYOUTS["azerty"][1]
+        self.assertEqual(set(graph["a"]) & set("&é\"'("), {"&", "é"})
+        self.assertTrue(_adjacent("a", "2") & AZERTY)
+
+
+class KeyboardWalkTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        app.load_data()
+
+    def test_vertical_and_zigzag_walks_are_counted(self) -> None:
+        for password in ("1qaz2wsx", "q2w3e4r", "zaq12wsx"):
+            self.assertGreater(app._extract_features(password).walks, 0, password)
+
+    def test_zigzag_walks_are_priced_as_keyboard_patterns(self) -> None:
+        for password in ("1q2w3e4r", "q2w3e4r5t6"):
+            matches = list(GuessEstimator._keyboard_matches(password))
+            self.assertEqual([(m[0], m[1], m[2]) for m in matches],
+                             [(0, len(password), "keyboard")], password)
+        log_g, sequence = app._GUESS_ESTIMATOR.estimate("q2w3e4r5t6")
+        self.assertEqual([part[2] for part in sequence], ["keyboard"])
+        self.assertLess(log_g, 10.0)  # brute force would be 10 ** 10
+
+
+if __name__ == "__main__":
+    unittest.main()
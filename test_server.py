@@ -0,0 +1,66 @@
+import asyncio
+import io
+import json
+import unittest
+from unittest import mock
+
+from server import ScoringService
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.data = b""
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+
+def _request(service: ScoringService, raw: bytes) -> tuple:
+    async def run() -> tuple:
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        writer = _Writer()
+        keep_alive = await service._handle_request(await reader.readline(), reader, writer)
+        head, _, body = writer.data.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body), keep_alive
+
+    return asyncio.run(run())
+
+
+class ContentLengthTest(unittest.TestCase):
+    def test_invalid_content_length_is_400(self) -> None:
+        service = ScoringService(workers=1)
+        for value in (b"abc", b"-5", b"1e3", b"\xc2\xb2"):
+            raw = b"POST /evaluate HTTP/1.1\r\nContent-Length: " + value + b"\r\n\r\n{}"
+            status, payload, keep_alive = _request(service, raw)
+            self.assertEqual(status, 400, value)
+            self.assertEqual(payload, {"error": "Invalid Content-Length."})
+            self.assertFalse(keep_alive)
+
+    def test_transfer_encoding_is_refused(self) -> None:
+        service = ScoringService(workers=1)
+        raw = (b"POST /evaluate HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+               b"10\r\n{\"password\":\"x\"}\r\n0\r\n\r\n")
+        status, payload, keep_alive = _request(service, raw)
+        self.assertEqual(status, 501)
+        self.assertEqual(payload, {"error": "Transfer-Encoding is not supported."})
+        self.assertFalse(keep_alive)
+
+    def test_internal_errors_are_500_and_not_echoed(self) -> None:
+        service = ScoringService(workers=1)
+
+        async def failing_route(*_args) -> None:
+            raise RuntimeError("secret internals")
+
+        with mock.patch.object(service, "_route", failing_route), \
+                mock.patch("sys.stderr", new_callable=io.StringIO) as log:
+            raw = b'POST /evaluate HTTP/1.1\r\nContent-Length: 16\r\n\r\n{"password":"x"}'
+            status, payload, keep_alive = _request(service, raw)
+        self.assertEqual(status, 500)
+        self.assertEqual(payload, {"error": "Scoring failed."})
+        self.assertFalse(keep_alive)
+        self.assertIn("secret internals", log.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
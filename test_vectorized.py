@@ -0,0 +1,32 @@
+import random
+import string
+import unittest
+
+import app
+import vectorized
+
+
+@unittest.skipIf(vectorized.np is None, "NumPy not installed")
+class ScoreBatchParityTest(unittest.TestCase):
+    def test_matches_evaluate_password(self) -> None:
+        rng = random.Random(1234)
+        app.load_data()
+        words = sorted(app.COMMON_WORDS | app.COMMON_PASSWORDS)
+        alphabet = string.ascii_letters + string.digits + string.punctuation + " "
+        corpus = ["", " ", "a", "héllo", "pässwörd123!", "日本語のパスワード", "\x00abc",
+                  "x" * 200, "Ab1!" * 40, "qwerty", "P@ssw0rd", "zaq12wsx", "1q2w3e4r"]
+        corpus += ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 24)))
+                   for _ in range(1500)]
+        corpus += [rng.choice(words) + "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4)))
+                   for _ in range(1500)]
+        corpus += [app._deleet(w).upper() for w in words]
+
+        batch = vectorized.score_batch(corpus)
+        for i, password in enumerate(corpus):
+            expected = app.evaluate_password(password)
+            got = {key: batch[key][i] for key in ("score", "entropy_bits", "label", "color")}
+            self.assertEqual(got, {key: expected[key] for key in got}, repr(password))
+
+
+if __name__ == "__main__":
+    unittest.main()
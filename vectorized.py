@@ -0,0 +1,291 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency; only needed for batch scoring
+    np = None
+
+import app
+import keyboard
+
+
+# ---------------------------
+# Vectorized batch scoring (NumPy)
+# ---------------------------
+#
+# Packs passwords into a padded code-point matrix and computes the same
+# score, label and entropy as evaluate_password with array operations.
+# Dictionary and common-password checks use per-length rolling hashes of
+# every window, compared against hashed word tables. Rows the tables cannot
+# represent (non-ASCII, NUL, very long) are scored by the scalar function.
+
+MAX_VECTOR_LEN = 64
+CHUNK_ROWS = 65536
+SUB_BATCH_ROWS = 4096
+# Windows of up to 9 seven-bit characters pack into a uint64 exactly; longer
+# ones wrap and are confirmed with the scalar matcher.
+_HASH_BASE = 128
+_EXACT_HASH_LEN = 9
+
+LABELS = ("Very Weak", "Weak", "Fair", "Good", "Very Strong")
+COLORS = ("#e74c3c", "#e67e22", "#f1c40f", "#2ecc71", "#27ae60")
+_LABEL_BOUNDS = (30, 50, 70, 85)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("Batch scoring requires NumPy (pip install numpy).")
+
+
+def _tables() -> dict:
+    # 128-entry lookup tables for character classes and the lower/deleet views
+    symbols = np.zeros(128, dtype=bool)
+    for ch in app.SAFE_SYMBOLS:
+        symbols[ord(ch)] = True
+    codes = np.arange(128)
+    lower = np.array([ord(chr(c).lower()) for c in range(128)], dtype=np.uint64)
+    deleet = np.array([ord(app._deleet(chr(c))) for c in range(128)], dtype=np.uint64)
+    # charset size for each of the 16 class-flag combinations, as log2
+    log2_size = np.array([
+        math.log2(app._charset_size_from(bool(i & 1), bool(i & 2), bool(i & 4), bool(i & 8)))
+        for i in range(16)
+    ], dtype=np.float64)
+    return {
+        "is_lower": (codes >= 97) & (codes <= 122),
+        "is_upper": (codes >= 65) & (codes <= 90),
+        "is_digit": (codes >= 48) & (codes <= 57),
+        "is_symbol": symbols,
+        "lower": lower,
+        "deleet": deleet,
+        "log2_size": log2_size,
+        "adjacent": np.frombuffer(keyboard.ADJACENT, dtype=np.uint8),
+    }
+
+
+# Multiplicative hash into a small bitmap that rejects most windows before the
+# exact (sorted-table) membership check
+_FILTER_BITS = 18
+_FILTER_MULT = np.uint64(0x9E3779B97F4A7C15) if np is not None else None
+_FILTER_SHIFT = np.uint64(64 - _FILTER_BITS) if np is not None else None
+
+
+def _filter_slots(values):
+    return (values * _FILTER_MULT) >> _FILTER_SHIFT
+
+
+def _hash_words(words) -> dict:
+    # {length: (sorted uint64 hashes, prefilter bitmap)}
+    by_len = {}
+    for w in words:
+        if not w or max(map(ord, w)) >= 128:
+            continue
+        h = 0
+        for ch in w:
+            h = (h * _HASH_BASE + ord(ch)) & 0xFFFFFFFFFFFFFFFF
+        by_len.setdefault(len(w), []).append(h)
+    tables = {}
+    for n, hs in by_len.items():
+        hashes = np.unique(np.array(hs, dtype=np.uint64))
+        bitmap = np.zeros(1 << _FILTER_BITS, dtype=bool)
+        bitmap[_filter_slots(hashes)] = True
+        tables[n] = (hashes, bitmap)
+    return tables
+
+
+_CACHE = {}
+
+
+def _word_tables() -> tuple:
+    # Rebuilt whenever app changes its dictionaries (load_common_words,
+    # install_dictionaries)
+    key = app.DICT_GENERATION
+    cached = _CACHE.get("words")
+    if cached is None or cached[0] != key:
+        cached = (key, _hash_words(app._WORD_MATCHER.words), _hash_words(app.COMMON_PASSWORDS))
+        _CACHE["words"] = cached
+    return cached[1], cached[2]
+
+
+def _prefix_hashes(view):
+    n, width = view.shape
+    prefix = np.zeros((n, width + 1), dtype=np.uint64)
+    base = np.uint64(_HASH_BASE)
+    for k in range(width):
+        prefix[:, k + 1] = prefix[:, k] * base + view[:, k]
+    return prefix
+
+
+def _window_hits(prefix, lengths, size: int, table):
+    # Rows with any window of `size` chars whose hash is in `table`
+    width = prefix.shape[1] - 1
+    if size > width:
+        return np.zeros(prefix.shape[0], dtype=bool)
+    scale = np.uint64(pow(_HASH_BASE, size, 1 << 64))
+    windows = prefix[:, size:] - prefix[:, :width + 1 - size] * scale
+    valid = np.arange(width + 1 - size)[None, :] + size <= lengths[:, None]
+    return (_member(windows, table) & valid).any(axis=1)
+
+
+def _member(values, table):
+    # np.isin against an already-sorted table, without re-sorting it per call
+    hashes, bitmap = table
+    hit = bitmap[_filter_slots(values)]
+    candidates = values[hit]
+    if candidates.size:
+        pos = np.minimum(np.searchsorted(hashes, candidates), len(hashes) - 1)
+        hit[hit] = hashes[pos] == candidates
+    return hit
+
+
+def _score_chunk(passwords: list, tables: dict) -> tuple:
+    n = len(passwords)
+    scores = np.zeros(n, dtype=np.int64)
+    entropy = np.zeros(n, dtype=np.float64)
+
+    vector_rows = []
+    for i, p in enumerate(passwords):
+        if p and len(p) <= MAX_VECTOR_LEN and p.isascii() and "\x00" not in p:
+            vector_rows.append(i)
+        else:
+            res = app.evaluate_password(p, guesses=False)  # score/entropy only
+            scores[i] = res["score"]
+            entropy[i] = res["entropy_bits"]
+
+    # Similar lengths together keep the padded matrices narrow
+    vector_rows.sort(key=lambda i: len(passwords[i]))
+    for start in range(0, len(vector_rows), SUB_BATCH_ROWS):
+        vidx = np.array(vector_rows[start:start + SUB_BATCH_ROWS])
+        score, ent = _score_rows([passwords[i] for i in vidx], tables)
+        scores[vidx] = score
+        entropy[vidx] = ent
+    return scores, entropy
+
+
+def _score_rows(rows: list, tables: dict) -> tuple:
+    # rows: non-empty ASCII passwords without NUL, at most MAX_VECTOR_LEN long
+    lengths = np.fromiter((len(p) for p in rows), dtype=np.int64, count=len(rows))
+    width = int(lengths.max())
+    buf = np.zeros((len(rows), width), dtype=np.uint8)
+    flat = "".join(p.ljust(width, "\x00") for p in rows).encode("ascii")
+    buf[:] = np.frombuffer(flat, dtype=np.uint8).reshape(len(rows), width)
+    valid = buf != 0
+
+    is_lower = tables["is_lower"][buf] & valid
+    is_upper = tables["is_upper"][buf] & valid
+    is_digit = tables["is_digit"][buf] & valid
+    is_symbol = tables["is_symbol"][buf] & valid
+    lowers = is_lower.any(axis=1)
+    uppers = is_upper.any(axis=1)
+    digits = is_digit.any(axis=1)
+    symbols = is_symbol.any(axis=1)
+    n_alpha = (is_lower | is_upper).sum(axis=1)
+    n_digit = is_digit.sum(axis=1)
+    only_alpha = n_alpha == lengths
+    only_digits = n_digit == lengths
+
+    # Distinct characters: count value changes in each sorted row, ignoring padding
+    ordered = np.sort(buf, axis=1)
+    distinct = (ordered[:, 0] != 0).astype(np.int64)
+    if width > 1:
+        distinct += ((ordered[:, 1:] != ordered[:, :-1]) & (ordered[:, 1:] != 0)).sum(axis=1)
+
+    # Run patterns, as in app._extract_features: letter/digit triples
+    # stepping by +1 or -1, triples of one character, and 4-key keyboard
+    # walks that are not plain +1/-1 runs
+    seqs = np.zeros(len(rows), dtype=np.int64)
+    repeats = np.zeros(len(rows), dtype=np.int64)
+    walks = np.zeros(len(rows), dtype=np.int64)
+    if width >= 3:
+        codes = buf.astype(np.int16)
+        diff = codes[:, 1:] - codes[:, :-1]
+        d1, d2 = diff[:, :-1], diff[:, 1:]
+        unit = (d1 == 1) | (d1 == -1)
+        step = unit & (d2 == d1)
+        alpha = is_lower | is_upper
+        alpha3 = alpha[:, :-2] & alpha[:, 1:-1] & alpha[:, 2:]
+        digit3 = is_digit[:, :-2] & is_digit[:, 1:-1] & is_digit[:, 2:]
+        seqs = (step & (alpha3 | digit3)).sum(axis=1)
+        repeats = ((d1 == 0) & (d2 == 0) & valid[:, 2:]).sum(axis=1)
+    if width >= 4:
+        # Padding is NUL, whose row and column of the table are empty
+        pairs = tables["adjacent"][(codes[:, :-1] << 7) | codes[:, 1:]]
+        walk = (pairs[:, :-2] & pairs[:, 1:-1] & pairs[:, 2:]) != 0
+        walks = (walk & ~(step[:, :-1] & (diff[:, 2:] == d1[:, :-1]))).sum(axis=1)
+
+    # Dictionary and common-password checks over the lower and deleet views
+    word_tables, common_tables = _word_tables()
+    lower_view = tables["lower"][buf]
+    leet_view = tables["deleet"][lower_view]
+    prefixes = (_prefix_hashes(lower_view), _prefix_hashes(leet_view))
+    dictionary = np.zeros(len(rows), dtype=bool)
+    confirm_dictionary = np.zeros(len(rows), dtype=bool)
+    for size, table in word_tables.items():
+        for prefix in prefixes:
+            hit = _window_hits(prefix, lengths, size, table)
+            if size <= _EXACT_HASH_LEN:
+                dictionary |= hit
+            else:
+                confirm_dictionary |= hit & ~dictionary
+    idx = np.arange(len(rows))
+    common = np.zeros(len(rows), dtype=bool)
+    for prefix in prefixes:
+        full = prefix[idx, lengths]
+        for size, table in common_tables.items():
+            common |= (lengths == size) & _member(full, table)
+    for i in np.nonzero(confirm_dictionary & ~dictionary)[0]:
+        lower_p = rows[i].lower()
+        matcher = app._WORD_MATCHER
+        dictionary[i] = matcher.search(lower_p) or matcher.search(app._deleet(lower_p))
+    for i in np.nonzero(common & (lengths > _EXACT_HASH_LEN))[0]:
+        lower_p = rows[i].lower()
+        common[i] = lower_p in app.COMMON_PASSWORDS or app._deleet(lower_p) in app.COMMON_PASSWORDS
+    breached = np.zeros(len(rows), dtype=bool)
+    if app._BREACH_INDEX is not None:
+        for i in np.nonzero(~common)[0]:
+            breached[i] = rows[i] in app._BREACH_INDEX
+
+    # Same arithmetic as app._build_result
+    score = np.minimum(lengths, 20) * 2
+    score += 10 * (lowers.astype(np.int64) + uppers + digits + symbols)
+    categories = lowers.astype(np.int64) + uppers + digits + symbols
+    score += np.where(categories >= 3, 10, 0) + np.where(categories == 4, 5, 0)
+    score -= np.where(only_alpha, 15, 0) + np.where(only_digits, 20, 0)
+    repeated_ratio = 1 - distinct / np.maximum(1, lengths)
+    score -= np.where(repeated_ratio > 0.40, 15, np.where(repeated_ratio > 0.25, 10, 0))
+    score -= np.minimum(20, 10 * seqs)
+    score -= np.minimum(20, 10 * walks)
+    score -= np.minimum(15, 5 * repeats)
+    score -= np.where(common | breached, 40, 0)
+    score -= np.where(dictionary, 15, 0)
+    score = np.clip(score, 0, 100)
+
+    flags = (lowers.astype(np.int64) | (uppers.astype(np.int64) << 1)
+             | (digits.astype(np.int64) << 2) | (symbols.astype(np.int64) << 3))
+    ent = lengths * tables["log2_size"][flags]
+
+    return score, ent
+
+
+def score_batch(passwords) -> dict:
+    # Returns {"score", "entropy_bits", "label", "color"} arrays aligned with
+    # `passwords`; values equal evaluate_password's for every row.
+    _require_numpy()
+    app.load_data()
+    passwords = list(passwords)
+    tables = _CACHE.get("tables")
+    if tables is None:
+        tables = _CACHE["tables"] = _tables()
+    scores = np.zeros(len(passwords), dtype=np.int64)
+    entropy = np.zeros(len(passwords), dtype=np.float64)
+    for start in range(0, len(passwords), CHUNK_ROWS):
+        chunk = passwords[start:start + CHUNK_ROWS]
+        s, e = _score_chunk(chunk, tables)
+        scores[start:start + len(chunk)] = s
+        entropy[start:start + len(chunk)] = e
+    label_idx = np.searchsorted(np.array(_LABEL_BOUNDS), scores, side="right")
+    labels = np.array(LABELS, dtype=object)[label_idx]
+    colors = np.array(COLORS, dtype=object)[label_idx]
+    empty = np.fromiter((not p for p in passwords), dtype=bool, count=len(passwords))
+    labels[empty] = ""
+    colors[empty] = app.EMPTY_RESULT["color"]
+    return {"score": scores, "entropy_bits": entropy, "label": labels, "color": colors}
@@ -0,0 +1,122 @@
+import math
+import mmap
+import struct
+import unicodedata
+
+
+# ---------------------------
+# Indexed passphrase wordlists
+# ---------------------------
+#
+# File: a fixed header, `count + 1` little-endian uint64 offsets, then the
+# words as one UTF-8 blob. Word i is blob[offsets[i]:offsets[i + 1]], so a
+# lookup is two offset reads and one slice of the mmap: picking random
+# words costs the same for a 7,776-word EFF list as for a million words,
+# and nothing is loaded up front.
+#
+# Building normalises every word (NFC, lowercase, surrounding whitespace
+# stripped) and drops duplicates, so each index is one equally likely
+# outcome and entropy is exactly log2(count) bits per word.
+
+WORDLIST_MAGIC = b"LSGWORD1"
+WORDLIST_HEADER = struct.Struct("<8sQQ")  # magic, word count, blob bytes
+_OFFSET = struct.Struct("<Q")
+
+
+def _parse_line(line: str) -> str:
+    # "word", or EFF style "16326<TAB>word" (dice roll, then the word);
+    # anything else with inner whitespace is skipped
+    parts = line.split()
+    if len(parts) == 2 and parts[0].isdigit():
+        parts = parts[1:]
+    if len(parts) != 1:
+        return ""
+    return unicodedata.normalize("NFC", parts[0]).lower()
+
+
+def build_wordlist(sources, dst: str, encoding: str = "utf-8") -> tuple:
+    # Returns (words written, duplicates dropped). Words are sorted so the
+    # same sources always give the same file.
+    if isinstance(sources, str):
+        sources = [sources]
+    words = set()
+    seen = 0
+    for src in sources:
+        with open(src, "r", encoding=encoding, errors="strict") as fh:
+            for line in fh:
+                word = _parse_line(line)
+                if word:
+                    words.add(word)
+                    seen += 1
+    ordered = sorted(words)
+    encoded = [w.encode("utf-8") for w in ordered]
+    with open(dst, "wb") as out:
+        out.write(WORDLIST_HEADER.pack(WORDLIST_MAGIC, len(encoded), sum(map(len, encoded))))
+        offsets = bytearray()
+        pos = 0
+        for e in encoded:
+            offsets += _OFFSET.pack(pos)
+            pos += len(e)
+        offsets += _OFFSET.pack(pos)
+        out.write(offsets)
+        out.write(b"".join(encoded))
+    return len(encoded), seen - len(encoded)
+
+
+class Wordlist:
+    # Read-only sequence of words over an mmapped index; works anywhere a
+    # list of words does (len, indexing, iteration, secrets.choice)
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fh = open(path, "rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, blob_len = WORDLIST_HEADER.unpack_from(self._mm, 0)
+        if magic != WORDLIST_MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a wordlist index")
+        if not self.count:
+            self.close()
+            raise ValueError(f"{path}: wordlist is empty")
+        self._offsets = memoryview(self._mm)[WORDLIST_HEADER.size:WORDLIST_HEADER.size + 8 * (self.count + 1)].cast("Q")
+        self._blob = WORDLIST_HEADER.size + 8 * (self.count + 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("wordlist index out of range")
+        offsets, base = self._offsets, self._blob
+        return self._mm[base + offsets[i]:base + offsets[i + 1]].decode("utf-8")
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def __reduce__(self):
+        # Worker processes reopen the file instead of copying the words
+        return Wordlist, (self.path,)
+
+    @property
+    def bits_per_word(self) -> float:
+        return math.log2(self.count)
+
+    def close(self) -> None:
+        offsets = getattr(self, "_offsets", None)
+        if offsets is not None:
+            offsets.release()
+            self._offsets = None
+        for res in (self._mm, self._fh):
+            try:
+                res.close()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()